@@ -53,3 +53,20 @@ class TravelScoutItem:
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
+
+# ---------------------------
+# Event listing item (What's On spiders)
+# ---------------------------
+
+@dataclass(slots=True)
+class EventItem:
+    source: str
+    url: str
+    title: Optional[str]
+    description: Optional[str]
+    dates: Dict[str, Any]            # {"start", "end", "text"}
+    price: Optional[str]
+    location: Optional[str]
+    categories: Optional[List[str]]
+    image: Optional[str]
+    updated_at: str
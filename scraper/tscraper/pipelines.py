@@ -0,0 +1,43 @@
+# scraper/tscraper/pipelines.py
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from tscraper.utils import parse_date_range, build_embedding_text
+
+
+def _finish_event(pending: dict) -> tuple[tuple[str | None, str | None], str | None]:
+    """dateutil parsing + embedding text for one event; runs in the worker pool."""
+    dates = parse_date_range(pending["date_text"] or "")
+    text = build_embedding_text(
+        pending["name"], pending["description"], pending["location"],
+        pending["date_text"], pending["price_text"], pending["categories"],
+    )
+    return dates, text
+
+
+class EventPostParsePipeline:
+    """
+    Completes event dicts that a spider yields with a ``_pending`` payload:
+    fills ``event_dates`` start/end and ``text_for_embedding`` off the reactor
+    thread, so callbacks only do the DOM extraction. Items without ``_pending``
+    pass through untouched.
+    """
+
+    def open_spider(self, spider):
+        self._pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
+    def close_spider(self, spider):
+        self._pool.shutdown(wait=True)
+
+    async def process_item(self, item, spider):
+        pending = item.pop("_pending", None) if isinstance(item, dict) else None
+        if not pending:
+            return item
+        loop = asyncio.get_running_loop()
+        (start_iso, end_iso), text = await loop.run_in_executor(self._pool, _finish_event, pending)
+        item["event_dates"]["start"] = start_iso
+        item["event_dates"]["end"] = end_iso
+        item["text_for_embedding"] = text
+        return item
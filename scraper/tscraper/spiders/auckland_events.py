@@ -1,11 +1,15 @@
 # scraper/tscraper/spiders/auckland_events.py
 # -*- coding: utf-8 -*-
+import os
 import re
-from datetime import datetime
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import scrapy
-from parsel import Selector
+from scrapy.utils.defer import maybe_deferred_to_future
+from selectolax.lexbor import LexborHTMLParser
+from twisted.internet.threads import deferToThread
+
+from tscraper.utils import iter_sitemap_locs, utc_stamp
 
 try:
     from scrapy_playwright.page import PageMethod  # available via your settings
@@ -13,16 +17,65 @@ except Exception:  # pragma: no cover
     PageMethod = None
 
 
+# ---------- compiled patterns ----------
+_PAGES_RE = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
+_EVENT_URL_RE = re.compile(r"^https://(www\.)?aucklandnz\.com/events-hub/events/[^/]+$")
+
+# dates
+_MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10,
+    "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+# Pages print "Dec"/"December"/"DEC"; keying those spellings too lets the
+# lookup hit on the raw token without a .lower() copy.
+_MONTHS.update({k.title(): v for k, v in list(_MONTHS.items())})
+_MONTHS.update({k.upper(): v for k, v in list(_MONTHS.items())})
+_TODAY_RE = re.compile(r"\bToday\b|\bNow\b", re.I)
+# "<day> <month>" pairs and 20xx years, picked up in one left-to-right scan
+_DATE_TOKEN_RE = re.compile(r"(?P<day>\d{1,2})\s+(?P<mon>[A-Za-z]{3,9})|\b(?P<year>20\d{2})\b")
+
+# top meta list
+_FREE_RE = re.compile(r"\bFREE\b", re.I)
+_SKIP_META_RE = re.compile(r"View times|Plan your route|Plan your transport|Purchase tickets", re.I)
+
+
 class AucklandEventsSpider(scrapy.Spider):
     name = "auckland_events"
     allowed_domains = ["aucklandnz.com", "www.aucklandnz.com"]
     start_urls = ["https://www.aucklandnz.com/events-hub/events"]
 
+    # Event anchors, queried inside the Playwright page
+    _LINK_CSS = "a[href*='/events-hub/events/']"
+    # Resolve, strip query/fragment/trailing slash and filter in the browser, so
+    # only the final URL list crosses the Playwright channel (no HTML round-trip).
+    _JS_EVENT_URLS = """([sel, rx]) => {
+        const r = new RegExp(rx);
+        const out = new Set();
+        document.querySelectorAll(sel).forEach(a => {
+            try {
+                const u = new URL(a.getAttribute('href'), location.href);
+                const clean = u.origin + u.pathname.replace(/\\/+$/, '');
+                if (r.test(clean)) out.add(clean);
+            } catch (e) {}
+        });
+        return [...out];
+    }"""
+
     custom_settings = {
         # Politeness + stability; FEEDS is set from your workflow CLI
         "ROBOTSTXT_OBEY": True,
         "DOWNLOAD_TIMEOUT": 60,
         "DUPEFILTER_CLASS": "scrapy.dupefilters.RFPDupeFilter",
+        # Same JSONL records, encoded by orjson instead of the stdlib json encoder
+        "FEED_EXPORTERS": {"jsonlines": "tscraper.utils.OrjsonLinesItemExporter"},
+        # All listing pages (base + ?page=N) share one named browser context
+        "PLAYWRIGHT_CONTEXTS": {"listing": {"viewport": {"width": 1400, "height": 900}}},
+        # parse_event extracts fields on the reactor thread pool (see _extract_event)
+        "REACTOR_THREADPOOL_MAXSIZE": max(4, os.cpu_count() or 1),
+        # Listing harvest only needs markup and JS: skip images/fonts/media and analytics
+        "PLAYWRIGHT_ABORT_REQUEST": "tscraper.utils.should_abort_request",
     }
 
     # Optional CLI args (still supported):
@@ -37,14 +90,14 @@ class AucklandEventsSpider(scrapy.Spider):
 
         self.listing_range = None
         if listing_pages:
-            m = re.match(r"^\s*(\d+)\s*-\s*(\d+)\s*$", str(listing_pages))
+            m = _PAGES_RE.match(str(listing_pages))
             if m:
                 a, b = int(m.group(1)), int(m.group(2))
                 if b >= a:
                     self.listing_range = list(range(a, b + 1))
 
-        # de-dupe across all discovery paths
-        self._seen_links: set[str] = set()
+        # Detail URLs are de-duped by Scrapy's RFPDupeFilter; we only count them
+        self._emitted_count = 0
 
     # -------- utilities --------
 
@@ -52,13 +105,12 @@ class AucklandEventsSpider(scrapy.Spider):
     def _clean(s: str | None) -> str | None:
         if not s:
             return None
-        s = re.sub(r"\s+", " ", s).strip()
-        return s or None
+        # str.split() collapses and trims whitespace in one C-level pass
+        return " ".join(s.split()) or None
 
     @staticmethod
     def _join_text(nodes) -> str | None:
-        parts = [re.sub(r"\s+", " ", x).strip() for x in nodes or []]
-        parts = [p for p in parts if p]
+        parts = [p for p in (" ".join(x.split()) for x in nodes or []) if p]
         return " ".join(parts) if parts else None
 
     @staticmethod
@@ -66,42 +118,51 @@ class AucklandEventsSpider(scrapy.Spider):
         """Make absolute, strip query/fragment, keep only proper /events-hub/events/<slug>."""
         if not href:
             return None
+        # Fast path: plain absolute or root-relative hrefs (the vast majority) need
+        # no urljoin/urlsplit round-trip, just the trailing-slash trim.
+        if "?" not in href and "#" not in href and "/." not in href:
+            if href.startswith("https://"):
+                clean = href.rstrip("/")
+                return clean if _EVENT_URL_RE.match(clean) else None
+            if href.startswith("/events-hub/events/"):
+                clean = "https://www.aucklandnz.com" + href.rstrip("/")
+                return clean if _EVENT_URL_RE.match(clean) else None
         absu = urljoin("https://www.aucklandnz.com", href)
         scheme, netloc, path, _, _ = urlsplit(absu)
         if not scheme or not netloc or not path:
             return None
         path = path.rstrip("/")
         clean = urlunsplit((scheme, netloc, path, "", ""))
-        if re.match(r"^https://(www\.)?aucklandnz\.com/events-hub/events/[^/]+$", clean):
+        if _EVENT_URL_RE.match(clean):
             return clean
         return None
 
+    @staticmethod
+    def _to_iso(day: int, mon: str, year: int | None) -> str | None:
+        m = _MONTHS.get(mon) or _MONTHS.get(mon.lower())
+        if not (m and year):
+            return None
+        return f"{year:04d}-{m:02d}-{day:02d}"
+
     def _parse_dates(self, s: str | None) -> tuple[str | None, str | None]:
         # same lightweight date parser you already use
         if not s:
             return None, None
         txt = s.replace("–", "-").strip()
-        if re.search(r"\bToday\b|\bNow\b", txt, flags=re.I):
+        if _TODAY_RE.search(txt):
             return None, None
-        months = {
-            "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
-            "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
-            "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10,
-            "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
-        }
-        def to_iso(day: int, mon_name: str, year: int | None) -> str | None:
-            m = months.get(mon_name.lower())
-            if not (m and year):
-                return None
-            return f"{year:04d}-{m:02d}-{day:02d}"
-        dm = re.findall(r"(\d{1,2})\s+([A-Za-z]{3,9})", txt)
-        yrs = [int(y) for y in re.findall(r"\b(20\d{2})\b", txt)]
+        dm, yrs = [], []
+        for tok in _DATE_TOKEN_RE.finditer(txt):
+            if tok.group("year"):
+                yrs.append(int(tok.group("year")))
+            else:
+                dm.append((tok.group("day"), tok.group("mon")))
         if not dm:
             return None, None
         if len(dm) == 1:
             d1, m1 = int(dm[0][0]), dm[0][1]
             y1 = yrs[0] if yrs else None
-            return to_iso(d1, m1, y1), None
+            return self._to_iso(d1, m1, y1), None
         d1, m1 = int(dm[0][0]), dm[0][1]
         d2, m2 = int(dm[1][0]), dm[1][1]
         if len(yrs) == 1:
@@ -110,27 +171,58 @@ class AucklandEventsSpider(scrapy.Spider):
             y1, y2 = yrs[0], yrs[1]
         else:
             y1 = y2 = None
-        return to_iso(d1, m1, y1), to_iso(d2, m2, y2)
+        return self._to_iso(d1, m1, y1), self._to_iso(d2, m2, y2)
 
-    def _extract_top_meta(self, response: scrapy.http.Response) -> dict:
-        meta_texts = [self._clean(t) for t in response.xpath("//h1/following::ul[1]/li//text()").getall()]
+    @staticmethod
+    def _first_ul_after(node):
+        """Equivalent of XPath ``following::ul[1]`` for a selectolax node."""
+        while node is not None:
+            sib = node.next
+            while sib is not None:
+                if sib.tag == "ul":
+                    return sib
+                if sib.tag != "-text":
+                    inner = sib.css_first("ul")
+                    if inner is not None:
+                        return inner
+                sib = sib.next
+            node = node.parent
+        return None
+
+    def _extract_top_meta(self, tree: LexborHTMLParser) -> dict:
+        h1 = tree.css_first("h1")
+        ul = self._first_ul_after(h1) if h1 is not None else None
+        # \x1f keeps text nodes apart the way li//text() did
+        raw = ul.text(deep=True, separator="\x1f").split("\x1f") if ul is not None else []
+        meta_texts = [self._clean(t) for t in raw]
         meta_texts = [t for t in meta_texts if t]
         date_text = meta_texts[0] if meta_texts else None
         price = None
         location = None
         for t in meta_texts:
-            if "$" in t or re.search(r"\bFREE\b", t, flags=re.I):
+            if "$" in t or _FREE_RE.search(t):
                 price = t
                 break
         for t in meta_texts:
             if t == date_text or t == price:
                 continue
-            if re.search(r"View times|Plan your route|Plan your transport|Purchase tickets", t, flags=re.I):
+            if _SKIP_META_RE.search(t):
                 continue
             location = t
             break
         return {"date_text": date_text, "price": price, "location": location}
 
+    @staticmethod
+    def _listing_meta() -> dict:
+        return {"playwright": True, "playwright_include_page": True, "playwright_context": "listing"}
+
+    def _detail_request(self, url: str) -> scrapy.Request:
+        self._emitted_count += 1
+        return scrapy.Request(url, callback=self.parse_event)
+
+    def closed(self, reason):
+        self.logger.info("Yielded %d detail requests (duplicates dropped by the dupefilter)", self._emitted_count)
+
     # -------- crawling --------
 
     def start_requests(self):
@@ -138,7 +230,7 @@ class AucklandEventsSpider(scrapy.Spider):
         yield scrapy.Request(
             self.start_urls[0],
             callback=self.parse_listing_with_playwright,
-            meta={"playwright": True, "playwright_include_page": True},
+            meta=self._listing_meta(),
             dont_filter=True,
         )
 
@@ -149,7 +241,7 @@ class AucklandEventsSpider(scrapy.Spider):
                 yield scrapy.Request(
                     url,
                     callback=self.parse_listing_with_playwright,
-                    meta={"playwright": True, "playwright_include_page": True},
+                    meta=self._listing_meta(),
                     dont_filter=True,
                 )
 
@@ -163,7 +255,7 @@ class AucklandEventsSpider(scrapy.Spider):
     async def parse_listing_with_playwright(self, response: scrapy.http.Response):
         page = response.meta["playwright_page"]
         try:
-            await page.wait_for_selector("a[href*='/events-hub/events/']", timeout=15000)
+            await page.wait_for_selector(self._LINK_CSS, timeout=15000)
         except Exception:
             pass
 
@@ -199,14 +291,15 @@ class AucklandEventsSpider(scrapy.Spider):
                 except Exception:
                     continue
 
-            html = await page.content()
-            sel = Selector(text=html)
-            hrefs = set(sel.css("a[href*='/events-hub/events/']::attr(href)").getall())
-            normalized = {self._normalize_event_url(h) for h in hrefs}
-            normalized.discard(None)
+            # Progress check only: count anchors in the live DOM instead of
+            # serialising and re-parsing the page every round
+            try:
+                count = await page.evaluate("s => document.querySelectorAll(s).length", self._LINK_CSS)
+            except Exception:
+                count = last_count
 
-            if len(normalized) > last_count:
-                last_count = len(normalized)
+            if count > last_count:
+                last_count = count
                 stagnant_rounds = 0
             else:
                 stagnant_rounds += 1
@@ -214,63 +307,93 @@ class AucklandEventsSpider(scrapy.Spider):
             if not clicked and stagnant_rounds >= 3:
                 break
 
-        # Close page and schedule details
-        html = await page.content()
+        # Collect normalized event URLs in-page, close it, then schedule details
+        try:
+            urls = await page.evaluate(self._JS_EVENT_URLS, [self._LINK_CSS, _EVENT_URL_RE.pattern])
+        except Exception as e:
+            self.logger.warning("Could not collect event links from %s: %s", response.url, e)
+            urls = []
         await page.close()
 
-        sel = Selector(text=html)
-        hrefs = set(sel.css("a[href*='/events-hub/events/']::attr(href)").getall())
-        for h in hrefs:
-            u = self._normalize_event_url(h)
-            if u and u not in self._seen_links:
-                self._seen_links.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        for u in urls:
+            yield self._detail_request(u)
 
     def parse_sitemap_index(self, response: scrapy.http.Response):
         # Follow any children and collect direct event URLs
-        locs = response.xpath("//loc/text()").getall()
-        for loc in locs:
+        for loc in iter_sitemap_locs(response.body):
             if loc.endswith(".xml"):
-                # follow all sub-sitemaps; they often contain events
-                yield scrapy.Request(loc, callback=self.parse_sitemap_leaf, dont_filter=True)
+                # follow all sub-sitemaps; they often contain events. Higher priority
+                # so every leaf is fetched before the detail-page fan-out queues up.
+                yield scrapy.Request(loc, callback=self.parse_sitemap_leaf, dont_filter=True, priority=100)
             else:
                 u = self._normalize_event_url(loc)
-                if u and u not in self._seen_links:
-                    self._seen_links.add(u)
-                    yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+                if u:
+                    yield self._detail_request(u)
 
     def parse_sitemap_leaf(self, response: scrapy.http.Response):
-        for loc in response.xpath("//url/loc/text()").getall():
+        for loc in iter_sitemap_locs(response.body, parents=("url",)):
             u = self._normalize_event_url(loc)
-            if u and u not in self._seen_links:
-                self._seen_links.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+            if u:
+                yield self._detail_request(u)
 
     # -------- detail pages --------
 
-    def parse_event(self, response: scrapy.http.Response):
-        title = self._clean(response.css("h1::text").get())
+    async def parse_event(self, response: scrapy.http.Response):
+        # Nothing to extract from non-200s, non-HTML bodies (PDFs, feeds) or
+        # redirects that landed outside /events-hub/events/<slug>
+        if response.status != 200:
+            return
+        ctype = (response.headers.get(b"Content-Type") or b"").lower()
+        if ctype and b"html" not in ctype:
+            return
+        if not self._normalize_event_url(response.url):
+            return
+
+        # Parsing and field extraction run in a worker thread so the reactor keeps
+        # servicing downloads meanwhile; only scheduling happens back here.
+        item, links = await maybe_deferred_to_future(deferToThread(self._extract_event, response))
+        item["updated_at"] = utc_stamp()
+        yield item
 
-        desc = self._join_text(response.css(".field--name-body p::text, .field--name-body li::text").getall())
+        # Opportunistically follow additional event links found on the page
+        for u in links:
+            yield self._detail_request(u)
+
+    def _extract_event(self, response: scrapy.http.Response) -> tuple[dict, list[str]]:
+        """Thread-safe: reads only ``response`` and module constants, touches no spider state."""
+        # One lexbor parse per detail page; every field below reads from this tree
+        tree = LexborHTMLParser(response.text)
+
+        def texts(css: str) -> list[str]:
+            return [n.text(deep=False) for n in tree.css(css)]
+
+        def attr(css: str, name: str) -> str | None:
+            node = tree.css_first(css)
+            return node.attributes.get(name) if node is not None else None
+
+        h1 = tree.css_first("h1")
+        title = self._clean(h1.text(deep=False)) if h1 is not None else None
+
+        desc = self._join_text(texts(".field--name-body p, .field--name-body li"))
         if not desc:
-            desc = self._join_text(response.css("main p::text").getall()) or \
-                   self._clean(response.css("meta[name='description']::attr(content)").get())
+            desc = self._join_text(texts("main p")) or \
+                   self._clean(attr("meta[name='description']", "content"))
 
-        top_meta = self._extract_top_meta(response)
+        top_meta = self._extract_top_meta(tree)
         dates_text = top_meta.get("date_text")
         price = top_meta.get("price")
         location = top_meta.get("location")
 
         st, en = self._parse_dates(dates_text)
 
-        cats = response.css("[class*='category'] a::text, .tags a::text").getall()
+        cats = texts("[class*='category'] a, .tags a")
         cats = [self._clean(c) for c in cats if self._clean(c)] or None
 
-        image = response.css("meta[property='og:image']::attr(content)").get()
+        image = attr("meta[property='og:image']", "content")
         if not image:
-            image = response.css("meta[name='twitter:image']::attr(content)").get()
+            image = attr("meta[name='twitter:image']", "content")
         if not image:
-            img = response.css("article img::attr(src), main img::attr(src)").get()
+            img = attr("article img, main img", "src")
             if img:
                 image = urljoin(response.url, img)
 
@@ -284,13 +407,9 @@ class AucklandEventsSpider(scrapy.Spider):
             "location": location,
             "categories": cats or None,
             "image": image,
-            "updated_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+            "updated_at": None,  # stamped on the reactor thread
         }
-        yield item
 
-        # Opportunistically follow additional event links found on the page
-        for href in response.css("a[href^='/events-hub/events/']::attr(href)").getall():
-            u = self._normalize_event_url(href)
-            if u and u not in self._seen_links:
-                self._seen_links.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        links = [self._normalize_event_url(a.attributes.get("href"))
+                 for a in tree.css("a[href^='/events-hub/events/']")]
+        return item, [u for u in links if u]
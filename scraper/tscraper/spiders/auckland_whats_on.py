@@ -55,17 +55,24 @@ class AucklandWhatsOnSpider(scrapy.Spider):
                 "overwrite": False,
             }
         },
+        # Same JSONL records, encoded by orjson instead of the stdlib json encoder
+        "FEED_EXPORTERS": {"jsonlines": "tscraper.utils.OrjsonLinesItemExporter"},
     }
 
     PATH_FAMILIES = ("/activities/", "/attractions/", "/auckland-nightlife/")
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # One collection run, one timestamp: taken at spider creation, shared by every item
+        self._collected_at = datetime.now(timezone.utc).isoformat()
+
     # -------------- helpers --------------
     @staticmethod
     def _clean(s: str | None) -> str:
         if not s:
             return ""
-        s = re.sub(r"\s+", " ", s)
-        return s.replace("\xa0", " ").strip()
+        # str.split() treats NBSP as whitespace too, so one pass collapses and trims
+        return " ".join(s.split())
 
     @staticmethod
     def _hash_id(url: str) -> str:
@@ -119,7 +126,7 @@ class AucklandWhatsOnSpider(scrapy.Spider):
             "price": {"currency": "NZD", "min": None, "max": None, "text": None, "free": False},
             "opening_hours": None,
             "operating_months": None,
-            "data_collected_at": datetime.now(timezone.utc).isoformat(),
+            "data_collected_at": self._collected_at,
         }
 
     # -------------- crawl --------------
@@ -2,28 +2,123 @@
 # -*- coding: utf-8 -*-
 import re
 import json
-from datetime import datetime
+import asyncio
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import scrapy
 from parsel import Selector
 
+from tscraper.items import EventItem
+from tscraper.utils import element_selector, iter_sitemap_locs, utc_stamp
+
 try:
     from scrapy_playwright.page import PageMethod  # enabled by your settings
 except Exception:  # pragma: no cover
     PageMethod = None
 
 
+# ---------- compiled patterns ----------
+_WS_RE = re.compile(r"\s+")
+_PAGES_RE = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
+_HUB_RE = re.compile(r"/visit/whats-on/?$")
+_NON_DETAIL_RE = re.compile(
+    r"/visit/whats-on/(category|categories|tags?|search|page/|filters|series|venues|authors?)(/|$)"
+)
+
+# dates
+_MONTHS = {
+    "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
+    "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
+    "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
+}
+_HM24_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*(am|pm)\s*$", re.I)
+_TIME12 = r"\d{1,2}:\d{2}\s*(?:am|pm)"
+# One anchored alternation for the four supported layouts (see _parse_dates);
+# the branches are mutually exclusive, so a single match() picks the right one.
+_DATE_RE = re.compile(
+    r"^(?:"
+    # D) "3 Dec 2025 - 10 Dec 2025 | 1:10 pm - 2:00 pm"
+    r"(?P<d_d1>\d{1,2})\s+(?P<d_m1>[A-Za-z]{3,9})\s+(?P<d_y1>\d{4})\s*-\s*"
+    r"(?P<d_d2>\d{1,2})\s+(?P<d_m2>[A-Za-z]{3,9})\s+(?P<d_y2>\d{4})\s*\|\s*"
+    rf"(?P<d_st>{_TIME12})\s*-\s*(?P<d_en>{_TIME12})"
+    # A) "15 Dec 2025 | 6:00 pm - 7:30 pm"
+    r"|(?P<a_d>\d{1,2})\s+(?P<a_m>[A-Za-z]{3,9})\s+(?P<a_y>\d{4})\s*\|\s*"
+    rf"(?P<a_st>{_TIME12})\s*-\s*(?P<a_en>{_TIME12})"
+    # B) "3 - 8 March 2026"
+    r"|(?P<b_d1>\d{1,2})\s*-\s*(?P<b_d2>\d{1,2})\s+(?P<b_m>[A-Za-z]{3,9})\s+(?P<b_y>\d{4})"
+    # C) "15 Dec 2025"
+    r"|(?P<c_d>\d{1,2})\s+(?P<c_m>[A-Za-z]{3,9})\s+(?P<c_y>(?:19|20)\d{2})"
+    r")$",
+    re.I,
+)
+# Lite fallback: first "<day> <month>" and the first 19xx/20xx year after it
+_LITE_DATE_RE = re.compile(r"(\d{1,2})\s+([A-Za-z]{3,9}).*?\b((?:19|20)\d{2})\b")
+
+# prices
+_NUMS_RE = re.compile(r"\$?\s*([0-9]+)(?:\.([0-9]{1,2}))?")
+_FREE_RE = re.compile(r"\bfree\b", re.I)
+_KOHA_RE = re.compile(r"\b(koha|donation)\b", re.I)
+_PAID_RE = re.compile(r"\bpaid\b", re.I)
+
+# locations
+# Any one hit is enough: a city/suburb, a street type, a house/building number or a venue word.
+_ADDR_RE = re.compile(
+    r"\b(?:"
+    r"christchurch|lincoln|rangiora|kaiapoi|canterbury|central city"
+    r"|st(?:\.|reet)?|rd|road|ave|avenue|lane|ln|drive|dr|place|pl|terrace|highway|hwy|mall|park|centre|center|square"
+    r"|\d{1,5}"
+    r"|hall|stadium|arena|theatre|theater|cathedral|church|gallery|museum"
+    r")\b",
+    re.I,
+)
+
+# descriptions / images
+_DIGIT_RE = re.compile(r"\d")
+_BOILERPLATE_RES = tuple(
+    re.compile(p, re.I)
+    for p in (
+        r"Don't miss a thing",
+        r"Sign up to our newsletter",
+        r"Listing\s*#\d+",
+        r"managed by ccc",
+    )
+)
+_MULTI_PIPE_RE = re.compile(r"(?:\s*\|\s*){2,}")
+_SRCSET_W_RE = re.compile(r"(\d+)w")
+
+
 class ChristchurchEventsSpider(scrapy.Spider):
     """
     ChristchurchNZ "What's On" spider with robust date/price/location/description/image extraction.
     """
     name = "christchurch_events"
 
+    # Cookie banner: None = not probed yet, True = dismissed, False = never shown
+    _cookie_state: bool | None = None
+    _cookie_selectors = ("button:has-text('Accept')", "button:has-text('I agree')", "[aria-label*='Accept']")
+
+    # Heading text (lowercased) → bucket filled with the block that follows it
+    _HEADING_BUCKETS = (
+        ("event_info", ("event info",)),
+        ("pricing", ("pricing",)),
+        ("ticket_pricing", ("ticket pricing",)),
+        ("location", ("address", "location", "venue", "where")),
+    )
+    _XP_TOP_META = "//h1/following::ul[1]/li//text()"
+    _META_IMAGE_KEYS = ("og:image", "og:image:secure_url", "twitter:image")
+
+    # <dt> label (lowercased) → bucket filled with its <dd>
+    _DT_BUCKETS = (
+        ("dt_price", ("price", "cost")),
+        ("dt_location", ("address", "location", "venue")),
+    )
+
     custom_settings = {
         "ROBOTSTXT_OBEY": True,
         "DOWNLOAD_TIMEOUT": 60,
         "DUPEFILTER_CLASS": "scrapy.dupefilters.RFPDupeFilter",
+        # Listing harvest only needs markup and JS: skip images/fonts/media and analytics
+        "PLAYWRIGHT_ABORT_REQUEST": "tscraper.utils.should_abort_request",
     }
 
     # ---------- init & config ----------
@@ -52,8 +147,11 @@ class ChristchurchEventsSpider(scrapy.Spider):
         self.base = base.rstrip("/")
         self.domain = domain
         self.allow_re = re.compile(allow)
+        self._allow_match = self.allow_re.match  # bound once; called for every candidate href
         self.anchor_selector = anchor_selector
         self.linksel = linksel
+        # Element-only form of linksel for in-browser queries (no ::attr pseudo there)
+        self._link_elements = element_selector(linksel)
         self.js_listing = str(js_listing).strip().lower() != "false"
 
         # See-more selectors (|| separated); we also just scroll/virtualize
@@ -65,7 +163,6 @@ class ChristchurchEventsSpider(scrapy.Spider):
             "a:has-text('Load more')",
             "[data-drupal-views-infinite-scroll] button",
         ]
-
         try:
             self.load_more = max(0, int(str(load_more).strip()))
         except Exception:
@@ -74,14 +171,29 @@ class ChristchurchEventsSpider(scrapy.Spider):
         # pages=a-b
         self.page_range = None
         if pages:
-            m = re.match(r"^\s*(\d+)\s*-\s*(\d+)\s*$", str(pages))
+            m = _PAGES_RE.match(str(pages))
             if m:
                 a, b = int(m.group(1)), int(m.group(2))
                 if b >= a:
                     self.page_range = list(range(a, b + 1))
 
         self.sitemap_url = sitemap or self._default_sitemap(self.base)
-        self._seen: set[str] = set()
+        # Detail URLs are deduped by the scheduler's RFPDupeFilter; only count them here
+        self._emitted_count = 0
+        # Raw hrefs already handled; most anchors repeat on every load-more round
+        self._seen_href: set[str] = set()
+
+        # Root-relative tile hrefs ("/visit/whats-on/listing/<slug>") are by far the
+        # most common input; recognise them with one fullmatch instead of urljoin/urlsplit.
+        base_parts = urlsplit(self.base)
+        self._listing_prefix = f"{base_parts.scheme}://{base_parts.netloc}{base_parts.path}/listing/"
+        self._fast_link_re = re.compile(re.escape(base_parts.path) + r"/listing/([^/?#]+)/?(?:[?#].*)?")
+        # Plain string guards run before any regex; most rejected anchors are
+        # off-site or outside the listing section (nav, footer, socials).
+        self._site_prefixes = tuple(
+            f"{scheme}://{host}/" for scheme in ("http", "https") for host in (self.domain, f"www.{self.domain}")
+        )
+        self._section_marker = base_parts.path.rstrip("/") + "/"
 
         # start URLs / allowed domains
         self.start_urls = [self.base]
@@ -98,48 +210,50 @@ class ChristchurchEventsSpider(scrapy.Spider):
         if not s:
             return None
         s = s.replace("\u00a0", " ")
-        s = re.sub(r"\s+", " ", s).strip()
+        s = _WS_RE.sub(" ", s).strip()
         return s or None
 
     @staticmethod
     def _join_text(nodes) -> str | None:
-        parts = [re.sub(r"\s+", " ", (x or "")).replace("\u00a0", " ").strip() for x in nodes or []]
-        parts = [p for p in parts if p]
-        return " ".join(parts) if parts else None
+        # Join first, then collapse whitespace (incl. NBSP) in a single pass
+        text = _WS_RE.sub(" ", " ".join(x for x in nodes or () if x)).strip()
+        return text or None
 
     def _normalize_detail_url(self, href: str) -> str | None:
         """Accept only /visit/whats-on/<slug> or /visit/whats-on/listing/<slug>; strip query/fragment."""
         if not href:
             return None
-        absu = urljoin(self.base, href)
+        m = self._fast_link_re.fullmatch(href)
+        if m:
+            clean = self._listing_prefix + m.group(1)
+            return clean if self._allow_match(clean) else None
+        absu = href if href.startswith(("http://", "https://")) else urljoin(self.base, href)
         scheme, netloc, path, _, _ = urlsplit(absu)
         if not scheme or not netloc or not path:
             return None
         clean = urlunsplit((scheme, netloc, path.rstrip("/"), "", ""))
+        if self._section_marker not in clean or not clean.startswith(self._site_prefixes):
+            return None
 
         # exclude the hub itself and obvious non-detail paths
-        if re.search(r"/visit/whats-on/?$", clean):
+        if _HUB_RE.search(clean):
             return None
-        if re.search(r"/visit/whats-on/(category|categories|tags?|search|page/|filters|series|venues|authors?)(/|$)", clean):
+        if _NON_DETAIL_RE.search(clean):
             return None
 
-        return clean if self.allow_re.match(clean) else None
+        return clean if self._allow_match(clean) else None
 
     # ---------- dates ----------
-    def _month_num(self, mon: str) -> int | None:
-        months = {
-            "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-            "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-            "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-        }
-        return months.get((mon or "").lower())
+    @staticmethod
+    def _month_num(mon: str) -> int | None:
+        return _MONTHS.get(mon.lower()) if mon else None
 
     def _hm24(self, s_txt: str) -> str:
-        hh, mm, ap = re.match(r"^\s*(\d{1,2}):(\d{2})\s*(am|pm)\s*$", s_txt, re.I).groups()
-        hh, mm = int(hh), int(mm)
-        if ap.lower() == "pm" and hh != 12:
+        hh, mm, ap = _HM24_RE.match(s_txt).groups()
+        hh, mm, ap = int(hh), int(mm), ap.lower()
+        if ap == "pm" and hh != 12:
             hh += 12
-        if ap.lower() == "am" and hh == 12:
+        if ap == "am" and hh == 12:
             hh = 0
         return f"{hh:02d}:{mm:02d}:00"
 
@@ -153,64 +267,98 @@ class ChristchurchEventsSpider(scrapy.Spider):
         """
         if not t:
             return None, None
-        t = re.sub(r"\s+", " ", t).strip()
+        t = _WS_RE.sub(" ", t).strip()
 
-        # D) Cross-day range with times
-        m = re.match(
-            r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\s*-\s*(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\s*\|\s*"
-            r"([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))\s*-\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))$",
-            t, re.I
-        )
-        if m:
-            d1, mon1, y1, d2, mon2, y2, st_txt, en_txt = m.groups()
-            M1, M2 = self._month_num(mon1), self._month_num(mon2)
-            if M1 and M2:
-                st_iso = f"{int(y1):04d}-{M1:02d}-{int(d1):02d}T{self._hm24(st_txt)}"
-                en_iso = f"{int(y2):04d}-{M2:02d}-{int(d2):02d}T{self._hm24(en_txt)}"
-                return st_iso, en_iso
-
-        # A) Single day with times
-        m = re.match(
-            r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\s*\|\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))\s*-\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))$",
-            t, re.I
-        )
-        if m:
-            d, mon, y, st_txt, en_txt = m.groups()
-            M = self._month_num(mon)
-            if M:
-                st_iso = f"{int(y):04d}-{M:02d}-{int(d):02d}T{self._hm24(st_txt)}"
-                en_iso = f"{int(y):04d}-{M:02d}-{int(d):02d}T{self._hm24(en_txt)}"
-                return st_iso, en_iso
-
-        # B) Date range without times
-        m = re.match(r"^\s*(\d{1,2})\s*-\s*(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\s*$", t)
+        m = _DATE_RE.match(t)
         if m:
-            d1, d2, mon, y = m.groups()
-            M = self._month_num(mon)
-            if M:
-                return (f"{int(y):04d}-{M:02d}-{int(d1):02d}",
-                        f"{int(y):04d}-{M:02d}-{int(d2):02d}")
-
-        # C) Single date, no times
-        m = re.match(r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})$", t)
-        if m:
-            d, mon, y = m.groups()
-            M = self._month_num(mon)
-            if M:
-                iso = f"{int(y):04d}-{M:02d}-{int(d):02d}"
-                return iso, iso
+            g = m.groupdict()
+            if g["d_d1"]:
+                # D) Cross-day range with times
+                M1, M2 = self._month_num(g["d_m1"]), self._month_num(g["d_m2"])
+                if M1 and M2:
+                    st_iso = f"{int(g['d_y1']):04d}-{M1:02d}-{int(g['d_d1']):02d}T{self._hm24(g['d_st'])}"
+                    en_iso = f"{int(g['d_y2']):04d}-{M2:02d}-{int(g['d_d2']):02d}T{self._hm24(g['d_en'])}"
+                    return st_iso, en_iso
+            elif g["a_d"]:
+                # A) Single day with times
+                M = self._month_num(g["a_m"])
+                if M:
+                    day = f"{int(g['a_y']):04d}-{M:02d}-{int(g['a_d']):02d}"
+                    return f"{day}T{self._hm24(g['a_st'])}", f"{day}T{self._hm24(g['a_en'])}"
+            elif g["b_d1"]:
+                # B) Date range without times
+                M = self._month_num(g["b_m"])
+                if M:
+                    y = int(g["b_y"])
+                    return (f"{y:04d}-{M:02d}-{int(g['b_d1']):02d}",
+                            f"{y:04d}-{M:02d}-{int(g['b_d2']):02d}")
+            else:
+                # C) Single date, no times
+                M = self._month_num(g["c_m"])
+                if M:
+                    iso = f"{int(g['c_y']):04d}-{M:02d}-{int(g['c_d']):02d}"
+                    return iso, iso
 
         # Lite fallback
-        dm = re.findall(r"(\d{1,2})\s+([A-Za-z]{3,9})", t)
-        yrs = [int(y) for y in re.findall(r"\b(19|20)\d{2}\b", t)]
-        if dm and yrs:
-            d1, m1 = int(dm[0][0]), dm[0][1]
-            y1 = yrs[0]
+        m = _LITE_DATE_RE.search(t)
+        if m:
+            d1, m1, y1 = int(m.group(1)), m.group(2), int(m.group(3))
             M1 = self._month_num(m1)
             return (f"{y1:04d}-{M1:02d}-{d1:02d}" if M1 else None, None)
         return None, None
 
-    def _extract_date_text(self, response: scrapy.http.Response) -> str | None:
+    def _heading_blocks(self, sel: Selector) -> dict[str, str | None]:
+        """
+        One walk over h2/h3/h4: lowercase each heading once and collect the text of
+        the element right after it into every bucket of _HEADING_BUCKETS it matches.
+        """
+        found: dict[str, list] = {}
+        for h in sel.root.iter("h2", "h3", "h4"):
+            low = " ".join(h.text_content().split()).lower()
+            hits = [key for key, needles in self._HEADING_BUCKETS if any(n in low for n in needles)]
+            if not hits:
+                continue
+            nxt = h.getnext()
+            while nxt is not None and not isinstance(nxt.tag, str):  # skip comments/PIs
+                nxt = nxt.getnext()
+            if nxt is None:
+                continue
+            for key in hits:
+                found.setdefault(key, []).append(nxt)
+
+        out: dict[str, str | None] = {}
+        for key, blocks in found.items():
+            members = set(blocks)
+            txts = []
+            for el in blocks:
+                # a block nested inside another matched block is already covered
+                if any(a in members for a in el.iterancestors()):
+                    continue
+                txts.extend(el.xpath(".//text()"))
+            out[key] = self._clean(" ".join(txts)) if txts else None
+        return out
+
+    def _dt_blocks(self, sel: Selector) -> dict[str, str | None]:
+        """Same idea as _heading_blocks for <dt>/<dd> lists: one walk, case-fold in Python."""
+        found: dict[str, list] = {}
+        for dt in sel.root.iter("dt"):
+            low = dt.text_content().lower()
+            hits = [key for key, needles in self._DT_BUCKETS if any(n in low for n in needles)]
+            if not hits:
+                continue
+            dd = next(dt.itersiblings("dd"), None)
+            if dd is None:
+                continue
+            for key in hits:
+                dds = found.setdefault(key, [])
+                if dd not in dds:  # "Price"/"Cost" pairs can share one <dd>
+                    dds.append(dd)
+        return {
+            key: self._clean(" ".join(t for dd in dds for t in dd.xpath(".//text()")))
+            for key, dds in found.items()
+        }
+
+    def _extract_date_text(self, sel: Selector, blocks: dict[str, str | None]) -> str | None:
         """
         Try (in order):
           1) <time> text
@@ -218,117 +366,77 @@ class ChristchurchEventsSpider(scrapy.Spider):
           3) Legacy top meta list under <h1>
         """
         # 1) <time>
-        time_text = self._clean(" ".join(response.css("time::text").getall()))
+        time_text = self._clean(" ".join(sel.css("time::text").getall()))
         if time_text:
             return time_text
 
         # 2) Event info (h2/h3/h4) → next block
-        LOWER, UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
-        ev_txt = self._clean(" ".join(
-            response.xpath(
-                "//*[self::h2 or self::h3 or self::h4]"
-                "[contains(translate(normalize-space(.), $LOWER, $UPPER), 'event info')]"
-                "/following-sibling::*[1]//text()",
-                LOWER=LOWER, UPPER=UPPER
-            ).getall()
-        ))
+        ev_txt = blocks.get("event_info")
         if ev_txt:
             return ev_txt
 
         # 3) legacy top list
-        meta_texts = [self._clean(t) for t in response.xpath("//h1/following::ul[1]/li//text()").getall()]
+        meta_texts = [self._clean(t) for t in sel.xpath(self._XP_TOP_META).getall()]
         meta_texts = [t for t in meta_texts if t]
         return meta_texts[0] if meta_texts else None
 
     # ---------- price helpers ----------
+    @staticmethod
+    def _fmt_cents(cents: int) -> str:
+        dollars, rem = divmod(cents, 100)
+        return str(dollars) if not rem else f"{dollars}.{rem:02d}".rstrip("0")
+
     def _normalize_price_text(self, text: str | None) -> str | None:
         if not text:
             return None
-        t = re.sub(r"\s+", " ", text).strip()
-
-        nums = [x.replace(",", "") for x in re.findall(r"\$?\s*([0-9]+(?:\.[0-9]{1,2})?)", t)]
-        if nums:
-            has_dollar = "$" in t
-            vals = [float(n) for n in nums]
-            lo, hi = min(vals), max(vals)
+        t = _WS_RE.sub(" ", text).strip()
+
+        # Track min/max in integer cents; most prices are whole dollars, so no floats.
+        lo = hi = None
+        for whole, frac in _NUMS_RE.findall(t):
+            cents = int(whole) * 100 + (int(frac.ljust(2, "0")) if frac else 0)
+            if lo is None or cents < lo:
+                lo = cents
+            if hi is None or cents > hi:
+                hi = cents
+        if lo is not None:
+            cur = "$" if "$" in t else ""
             if lo == hi:
-                return f"${int(lo) if float(lo).is_integer() else lo:g}" if has_dollar else f"{lo:g}"
-            return (f"${int(lo) if float(lo).is_integer() else lo:g} - ${int(hi) if float(hi).is_integer() else hi:g}"
-                    if has_dollar else f"{lo:g} - {hi:g}")
+                return f"{cur}{self._fmt_cents(lo)}"
+            return f"{cur}{self._fmt_cents(lo)} - {cur}{self._fmt_cents(hi)}"
 
-        if re.search(r"\bfree\b", t, re.I):
+        if _FREE_RE.search(t):
             return "Free event"
-        if re.search(r"\b(koha|donation)\b", t, re.I):
+        if _KOHA_RE.search(t):
             return "Donation/koha"
-        if re.search(r"\bpaid\b", t, re.I):
+        if _PAID_RE.search(t):
             return "Paid event (see site)"
         return t or None
 
-    def _pricing_block_text(self, response: scrapy.http.Response) -> str | None:
-        LOWER, UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
-        txts = response.xpath(
-            "//*[self::h2 or self::h3 or self::h4]"
-            "[contains(translate(normalize-space(.), $LOWER, $UPPER), 'pricing')]"
-            "/following-sibling::*[1]//text()",
-            LOWER=LOWER, UPPER=UPPER
-        ).getall()
-        return self._clean(" ".join(txts)) if txts else None
-
-    def _dd_price_text(self, response: scrapy.http.Response) -> str | None:
-        txts = response.xpath(
-            "//dt[contains(translate(., 'PRICECOST', 'pricecost'), 'price') or "
-            "contains(translate(., 'PRICECOST', 'pricecost'), 'cost')]"
-            "/following-sibling::dd[1]//text()"
-        ).getall()
-        return self._clean(" ".join(txts)) if txts else None
-
-    def _ticket_label(self, response: scrapy.http.Response) -> str | None:
-        LOWER, UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
-        txt = self._clean(" ".join(
-            response.xpath(
-                "//*[self::h2 or self::h3 or self::h4]"
-                "[contains(translate(normalize-space(.), $LOWER, $UPPER), 'ticket pricing')]"
-                "/following-sibling::*[1]//text()",
-                LOWER=LOWER, UPPER=UPPER
-            ).getall()
-        ))
-        return txt or None
-
-    def _extract_price(self, response: scrapy.http.Response) -> str | None:
-        pb = self._normalize_price_text(self._pricing_block_text(response))
+    def _extract_price(self, blocks: dict[str, str | None]) -> str | None:
+        pb = self._normalize_price_text(blocks.get("pricing"))
         if pb:
             return pb
 
-        ticket = self._normalize_price_text(self._ticket_label(response))
+        ticket = self._normalize_price_text(blocks.get("ticket_pricing"))
         if ticket:
             if ticket.startswith("Paid event"):
-                dd = self._normalize_price_text(self._dd_price_text(response))
+                dd = self._normalize_price_text(blocks.get("dt_price"))
                 return dd or ticket
             return ticket
 
-        dd = self._normalize_price_text(self._dd_price_text(response))
+        dd = self._normalize_price_text(blocks.get("dt_price"))
         if dd:
             return dd
         return None
 
     # ---------- location helpers ----------
     def _looks_like_address(self, text: str | None) -> bool:
-        if not text:
-            return False
-        t = text.lower()
-        if re.search(r"\b(christchurch|lincoln|rangiora|kaiapoi|canterbury|central city)\b", t):
-            return True
-        if re.search(r"\b(st(?:\.|reet)?|rd|road|ave|avenue|lane|ln|drive|dr|place|pl|terrace|highway|hwy|mall|park|centre|center|square)\b", t):
-            return True
-        if re.search(r"\b\d{1,5}\b", t):  # likely house/building number
-            return True
-        if re.search(r"\b(centre|center|hall|stadium|arena|theatre|theater|cathedral|church|gallery|museum)\b", t):
-            return True
-        return False
+        return bool(text and _ADDR_RE.search(text))
 
-    def _extract_location(self, response: scrapy.http.Response) -> str | None:
+    def _extract_location(self, sel: Selector, blocks: dict[str, str | None]) -> str | None:
         # 1) Tailwind dd with stacked <p> lines
-        parts = [self._clean(t) for t in response.css('dd.space-y-0\\.5 p::text, dd[class*="space-y-0.5"] p::text').getall()]
+        parts = [self._clean(t) for t in sel.css('dd.space-y-0\\.5 p::text, dd[class*="space-y-0.5"] p::text').getall()]
         parts = [p for p in parts if p]
         if parts:
             candidate = " | ".join(parts)
@@ -336,47 +444,29 @@ class ChristchurchEventsSpider(scrapy.Spider):
                 return candidate
 
         # 2) dt=Address/Location/Venue → dd
-        dd_loc = self._clean(" ".join(
-            response.xpath(
-                "//dt[contains(translate(., 'ADDRESSLOCATIONVENUE', 'addresslocationvenue'), 'address') or "
-                "contains(translate(., 'ADDRESSLOCATIONVENUE', 'addresslocationvenue'), 'location') or "
-                "contains(translate(., 'ADDRESSLOCATIONVENUE', 'addresslocationvenue'), 'venue')]"
-                "/following-sibling::dd[1]//text()"
-            ).getall()
-        ))
+        dd_loc = blocks.get("dt_location")
         if dd_loc and self._looks_like_address(dd_loc):
             return dd_loc
 
         # 3) Heading 'Address'/'Location'/'Venue'/'Where' → next block
-        LOWER, UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
-        head_loc = self._clean(" ".join(
-            response.xpath(
-                "//*[self::h2 or self::h3 or self::h4]"
-                "[contains(translate(normalize-space(.), $LOWER, $UPPER), 'address') or "
-                " contains(translate(normalize-space(.), $LOWER, $UPPER), 'location') or "
-                " contains(translate(normalize-space(.), $LOWER, $UPPER), 'venue') or "
-                " contains(translate(normalize-space(.), $LOWER, $UPPER), 'where')]"
-                "/following-sibling::*[1]//text()",
-                LOWER=LOWER, UPPER=UPPER
-            ).getall()
-        ))
+        head_loc = blocks.get("location")
         if head_loc and self._looks_like_address(head_loc):
             return head_loc
 
         return "See website for details"
 
     # ---------- categories ----------
-    def _extract_categories(self, response: scrapy.http.Response) -> list[str] | None:
+    def _extract_categories(self, sel: Selector) -> list[str] | None:
         catline = self._clean(" ".join(
-            response.xpath("(//h1)[1]/preceding-sibling::*[1]//text()").getall()
+            sel.xpath("(//h1)[1]/preceding-sibling::*[1]//text()").getall()
         ))
-        if catline and "|" in catline and not re.search(r"\d", catline):
+        if catline and "|" in catline and not _DIGIT_RE.search(catline):
             cats = [self._clean(c) for c in catline.split("|")]
             cats = [c for c in cats if c]
             if 0 < len(cats) <= 6:
                 return cats
 
-        cats = response.css("[class*='category'] a::text, .tags a::text").getall()
+        cats = sel.css("[class*='category'] a::text, .tags a::text").getall()
         cats = [self._clean(c) for c in cats if self._clean(c)]
         return cats or None
 
@@ -386,25 +476,20 @@ class ChristchurchEventsSpider(scrapy.Spider):
             return None
         t = text
         # Cut off at newsletter/boilerplate markers if present
-        for pat in [
-            r"Don't miss a thing",
-            r"Sign up to our newsletter",
-            r"Listing\s*#\d+",
-            r"managed by ccc",
-        ]:
-            m = re.search(pat, t, re.I)
+        for pat in _BOILERPLATE_RES:
+            m = pat.search(t)
             if m:
                 t = t[:m.start()].rstrip()
         # Remove multiple pipes / leftover category prefixes
-        t = re.sub(r"(?:\s*\|\s*){2,}", " | ", t)
+        t = _MULTI_PIPE_RE.sub(" | ", t)
         return self._clean(t)
 
-    def _extract_description(self, response: scrapy.http.Response) -> str | None:
+    def _extract_description(self, sel: Selector) -> str | None:
         """
         Prefer rich-text body paragraphs (e.g., div.space-y-4 .prose p) then fallbacks.
         """
         # 1) The prose/rich text blocks (your example)
-        texts = response.css(
+        texts = sel.css(
             "main div.space-y-4 div.prose p ::text, "
             "main [class*='prose'] p ::text, "
             "article [class*='prose'] p ::text"
@@ -412,19 +497,18 @@ class ChristchurchEventsSpider(scrapy.Spider):
         desc = self._join_text(texts)
         if not desc:
             # 2) Generic body paragraphs (avoid dt/dd meta areas)
-            texts = response.css("main article p ::text, main p ::text").getall()
+            texts = sel.css("main article p ::text, main p ::text").getall()
             desc = self._join_text(texts)
 
         if not desc:
             # 3) Fallback to <meta name="description">
-            desc = self._clean(response.css("meta[name='description']::attr(content)").get())
+            desc = self._clean(sel.css("meta[name='description']::attr(content)").get())
 
         return self._strip_boilerplate(desc)
 
     # ---------- image helpers ----------
     @staticmethod
-    def _jsonld_objects(response_text: str):
-        sel = Selector(text=response_text or "")
+    def _jsonld_objects(sel: Selector):
         out = []
         for node in sel.xpath("//script[@type='application/ld+json']/text()").getall():
             try:
@@ -446,8 +530,8 @@ class ChristchurchEventsSpider(scrapy.Spider):
             return v[0] if v else default
         return v if v is not None else default
 
-    def _image_from_jsonld(self, response: scrapy.http.Response) -> str | None:
-        objs = self._jsonld_objects(response.text)
+    def _image_from_jsonld(self, sel: Selector, base_url: str) -> str | None:
+        objs = self._jsonld_objects(sel)
         for o in objs or []:
             img = None
             if isinstance(o, dict):
@@ -467,7 +551,7 @@ class ChristchurchEventsSpider(scrapy.Spider):
                 elif not isinstance(img, str):
                     img = None
             if img:
-                return urljoin(response.url, img)
+                return urljoin(base_url, img)
         return None
 
     @staticmethod
@@ -485,7 +569,7 @@ class ChristchurchEventsSpider(scrapy.Spider):
             url = bits[0]
             w = 0
             if len(bits) > 1:
-                m = re.search(r"(\d+)w", bits[1])
+                m = _SRCSET_W_RE.search(bits[1])
                 if m:
                     try:
                         w = int(m.group(1))
@@ -496,36 +580,42 @@ class ChristchurchEventsSpider(scrapy.Spider):
                 best = url
         return best
 
-    def _extract_image(self, response: scrapy.http.Response) -> str | None:
+    def _extract_image(self, sel: Selector, base_url: str) -> str | None:
         # 1) JSON-LD
-        img = self._image_from_jsonld(response)
+        img = self._image_from_jsonld(sel, base_url)
         if img:
             return img
 
-        # 2) Meta OG/Twitter
-        img = response.css("meta[property='og:image']::attr(content)").get() \
-              or response.css("meta[property='og:image:secure_url']::attr(content)").get() \
-              or response.css("meta[name='twitter:image']::attr(content)").get()
+        # 2) Meta OG/Twitter: fetch all three in one query, then pick by priority
+        metas: dict[str, str] = {}
+        for m in sel.xpath(
+            "//meta[@property='og:image' or @property='og:image:secure_url' or @name='twitter:image'][@content]"
+        ):
+            prop = m.attrib.get("property")
+            key = prop if prop in self._META_IMAGE_KEYS else m.attrib.get("name")
+            if m.attrib["content"]:
+                metas.setdefault(key, m.attrib["content"])
+        img = next((metas[k] for k in self._META_IMAGE_KEYS if k in metas), None)
         if img:
-            return urljoin(response.url, img)
+            return urljoin(base_url, img)
 
         # 3) Largest from <picture>/<img> srcset
-        srcset = response.css("main picture source::attr(srcset), main img::attr(srcset)").get()
+        srcset = sel.css("main picture source::attr(srcset), main img::attr(srcset)").get()
         best = self._pick_largest_from_srcset(srcset) if srcset else None
         if best:
-            return urljoin(response.url, best)
+            return urljoin(base_url, best)
 
         # 4) Lazy or plain img attributes near the hero/body
-        for sel in [
+        for css in [
             "main picture img::attr(src)",
             "main img::attr(data-src)",
             "main img::attr(data-lazy)",
             "main img::attr(src)",
             "article img::attr(src)",
         ]:
-            v = response.css(sel).get()
+            v = sel.css(css).get()
             if v:
-                return urljoin(response.url, v)
+                return urljoin(base_url, v)
 
         return None
 
@@ -558,31 +648,64 @@ class ChristchurchEventsSpider(scrapy.Spider):
         if self.sitemap_url:
             yield scrapy.Request(self.sitemap_url, callback=self.parse_sitemap_index, dont_filter=True)
 
-    async def _harvest_links_now(self, page) -> list[str]:
-        """Parse current DOM and return new normalized detail URLs."""
-        html = await page.content()
-        sel = Selector(text=html)
+    @staticmethod
+    async def _first_visible(page, selectors):
+        """
+        Probe every selector's first match concurrently and return the locator of the
+        first visible one in the given (priority) order, or None. Each selector keeps
+        its own Playwright engine (css, text=, xpath=, :has-text); one that fails to
+        probe simply counts as not visible.
+        """
+        locs = [page.locator(sel).first for sel in selectors]
+        visible = await asyncio.gather(*(loc.is_visible() for loc in locs), return_exceptions=True)
+        for loc, ok in zip(locs, visible):
+            if ok is True:
+                return loc
+        return None
+
+    async def _dismiss_cookie_banner(self, page) -> bool:
+        """Click the consent button if one shows up; return whether a banner was seen."""
+        await page.wait_for_timeout(500)
+        try:
+            loc = await self._first_visible(page, self._cookie_selectors)
+            if loc is not None:
+                await loc.click()
+                await page.wait_for_timeout(300)
+                return True
+        except Exception:
+            pass
+        return False
+
+    def _new_detail_urls(self, hrefs) -> list[str]:
+        """Normalize raw hrefs not handled before and return the detail URLs among them."""
         found = []
-        for h in sel.css(self.linksel).getall():
+        for h in hrefs:
+            if h in self._seen_href:
+                continue
+            self._seen_href.add(h)
             u = self._normalize_detail_url(h)
-            if u and u not in self._seen:
-                self._seen.add(u)
+            if u:
                 found.append(u)
+        self._emitted_count += len(found)
         return found
 
+    async def _harvest_links_now(self, page) -> list[str]:
+        """Read anchor hrefs straight from the live DOM and return new normalized detail URLs."""
+        try:
+            hrefs = await page.eval_on_selector_all(
+                self._link_elements, "els => els.map(e => e.getAttribute('href')).filter(Boolean)"
+            )
+        except Exception:
+            return []
+        return self._new_detail_urls(hrefs)
+
     async def parse_listing_with_playwright(self, response: scrapy.http.Response):
         page = response.meta["playwright_page"]
 
-        # Cookie banner (best effort)
-        for sel in ("button:has-text('Accept')", "button:has-text('I agree')", "[aria-label*='Accept']"):
-            try:
-                loc = page.locator(sel).first
-                if await loc.is_visible():
-                    await loc.click()
-                    await page.wait_for_timeout(300)
-                    break
-            except Exception:
-                pass
+        # Cookie banner (best effort). Consent lives in the shared browser context,
+        # so only the first listing page pays for the probe.
+        if self._cookie_state is None:
+            self._cookie_state = await self._dismiss_cookie_banner(page)
 
         # Wait for any listing anchor to exist (NOTE: element selector, not ::attr)
         try:
@@ -593,7 +716,7 @@ class ChristchurchEventsSpider(scrapy.Spider):
         # Harvest immediately
         initial = await self._harvest_links_now(page)
         for u in initial:
-            yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+            yield response.follow(u, callback=self.parse_event)
 
         stagnant_rounds = 0
         for _ in range(self.load_more):
@@ -606,23 +729,21 @@ class ChristchurchEventsSpider(scrapy.Spider):
 
             # Try likely "load more" controls if present
             clicked = False
-            for sel in self.more_selectors:
-                try:
-                    loc = page.locator(sel).first
-                    if await loc.is_visible():
-                        await loc.click()
-                        clicked = True
-                        try:
-                            await page.wait_for_load_state("networkidle", timeout=5000)
-                        except Exception:
-                            await page.wait_for_timeout(1200)
-                        break
-                except Exception:
-                    continue
+            try:
+                loc = await self._first_visible(page, self.more_selectors)
+                if loc is not None:
+                    await loc.click()
+                    clicked = True
+                    try:
+                        await page.wait_for_load_state("networkidle", timeout=5000)
+                    except Exception:
+                        await page.wait_for_timeout(1200)
+            except Exception:
+                pass
 
             new_links = await self._harvest_links_now(page)
             for u in new_links:
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+                yield response.follow(u, callback=self.parse_event)
 
             if new_links:
                 stagnant_rounds = 0
@@ -635,71 +756,72 @@ class ChristchurchEventsSpider(scrapy.Spider):
         # Final sweep
         final_links = await self._harvest_links_now(page)
         for u in final_links:
-            yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+            yield response.follow(u, callback=self.parse_event)
 
         await page.close()
-        self.logger.info("Discovered %d unique detail URLs", len(self._seen))
+        self.logger.info("Discovered %d detail URLs (duplicates dropped by the dupefilter)", self._emitted_count)
 
     def parse_listing(self, response: scrapy.http.Response):
-        for h in response.css(self.linksel).getall():
-            u = self._normalize_detail_url(h)
-            if u and u not in self._seen:
-                self._seen.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        for u in self._new_detail_urls(response.css(self.linksel).getall()):
+            yield response.follow(u, callback=self.parse_event)
 
     # ---------- sitemap fallbacks ----------
     def parse_sitemap_index(self, response: scrapy.http.Response):
-        for loc in response.xpath("//loc/text()").getall():
+        pages = []
+        for loc in iter_sitemap_locs(response.body):
             if loc.endswith(".xml"):
                 yield scrapy.Request(loc, callback=self.parse_sitemap_leaf, dont_filter=True)
-            else:
-                u = self._normalize_detail_url(loc)
-                if u and u not in self._seen:
-                    self._seen.add(u)
-                    yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+            elif self._section_marker in loc:
+                pages.append(loc)
+        for u in self._new_detail_urls(pages):
+            yield response.follow(u, callback=self.parse_event)
 
     def parse_sitemap_leaf(self, response: scrapy.http.Response):
-        for loc in response.xpath("//url/loc/text()").getall():
-            u = self._normalize_detail_url(loc)
-            if u and u not in self._seen:
-                self._seen.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        # Most sitemap entries are site pages outside What's On; drop them before
+        # they reach the href memo and URL normalisation.
+        locs = [loc for loc in iter_sitemap_locs(response.body) if self._section_marker in loc]
+        for u in self._new_detail_urls(locs):
+            yield response.follow(u, callback=self.parse_event)
 
     # ---------- detail pages ----------
     def parse_event(self, response: scrapy.http.Response):
+        # One selector for the whole page; headings and <dt> labels are walked once each
+        sel = response.selector
+        blocks = {**self._heading_blocks(sel), **self._dt_blocks(sel)}
+
         # Title
-        title = self._clean(response.css("h1::text").get()) \
-            or self._clean(response.css("meta[property='og:title']::attr(content)").get()) \
-            or self._clean(response.css("title::text").get())
+        title = self._clean(sel.css("h1::text").get()) \
+            or self._clean(sel.css("meta[property='og:title']::attr(content)").get()) \
+            or self._clean(sel.css("title::text").get())
 
         # Description (rich-text body preferred)
-        desc = self._extract_description(response)
+        desc = self._extract_description(sel)
 
         # Dates
-        dates_text = self._extract_date_text(response)
+        dates_text = self._extract_date_text(sel, blocks)
         st, en = self._parse_dates(dates_text)
 
         # Location (strict, address-like only)
-        location = self._extract_location(response)
+        location = self._extract_location(sel, blocks)
 
         # Price
-        price = self._extract_price(response)
+        price = self._extract_price(blocks)
 
         # Categories
-        cats = self._extract_categories(response)
+        cats = self._extract_categories(sel)
 
         # Image (JSON-LD -> OG/Twitter -> largest srcset -> lazy/plain img)
-        image = self._extract_image(response)
-
-        yield {
-            "source": self.domain.split(".")[0],
-            "url": response.url,
-            "title": title,
-            "description": desc,
-            "dates": {"start": st, "end": en, "text": dates_text},
-            "price": price,
-            "location": location,
-            "categories": cats or None,
-            "image": image,
-            "updated_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
-        }
+        image = self._extract_image(sel, response.url)
+
+        yield EventItem(
+            source=self.domain.split(".")[0],
+            url=response.url,
+            title=title,
+            description=desc,
+            dates={"start": st, "end": en, "text": dates_text},
+            price=price,
+            location=location,
+            categories=cats or None,
+            image=image,
+            updated_at=utc_stamp(),
+        )
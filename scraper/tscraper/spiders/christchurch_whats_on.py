@@ -1,11 +1,16 @@
 # scraper/tscraper/spiders/christchurch_events.py
 # -*- coding: utf-8 -*-
 import re
-from datetime import datetime
+import hashlib
+import functools
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import scrapy
-from parsel import Selector
+from lxml import etree
+from lxml.html import HTMLParser
+from parsel.csstranslator import css2xpath
+
+from tscraper.utils import element_selector, iter_sitemap_locs, utc_stamp
 
 try:
     from scrapy_playwright.page import PageMethod  # enabled by settings if installed
@@ -13,16 +18,268 @@ except Exception:  # pragma: no cover
     PageMethod = None
 
 
+# ---------- compiled patterns ----------
+_WS_RE = re.compile(r"\s+")
+_PAGES_RE = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
+# Playwright's "css:has-text('Text')" pseudo-class, rewritten for querySelectorAll
+_HAS_TEXT_RE = re.compile(r"^(.*?):has-text\((['\"])(.*)\2\)$")
+# First path segment under /visit/whats-on/ that marks an index page, not an event
+_NON_DETAIL_SEGMENTS = frozenset((
+    "category", "categories", "tag", "tags", "search", "filters", "series", "venues", "author", "authors",
+))
+
+# dates
+# Keyed by 3-letter stem: every spelling ("Sep", "Sept", "September") shares one
+# unique prefix, so lookups lowercase three characters instead of the whole token
+_MONTHS = {
+    "jan":1,"feb":2,"mar":3,"apr":4,"may":5,"jun":6,
+    "jul":7,"aug":8,"sep":9,"oct":10,"nov":11,"dec":12,
+}
+# "15 Dec 2025 | 6:00 pm - 7:30 pm"
+_DATE_TIMES_RE = re.compile(
+    r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})\s*\|\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))\s*-\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))$",
+    re.I,
+)
+# "3 - 8 March 2026"
+_DATE_RANGE_RE = re.compile(r"^\s*(\d{1,2})\s*-\s*(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})\s*$")
+# "15 Dec 2025"
+_DATE_SINGLE_RE = re.compile(r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})$")
+_HM_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*(am|pm)\s*$", re.I)
+_DAY_MON_YEAR_RE = re.compile(r"\d{1,2}\s+[A-Za-z]{3,9}\s+(?:19|20)\d{2}")
+_DIGIT_RE = re.compile(r"\d")
+# Raw-body pre-checks: skip an XPath when its label cannot be on the page at all
+_EVENT_INFO_HINT_RE = re.compile(rb"Event(?:\s|<[^>]*>)*info")
+_PRICING_HINT_RE = re.compile(rb"pric|admission", re.I)
+
+# prices
+_DOLLAR_AMOUNT_RE = re.compile(r"\$\s*\d")
+# Amounts and free/paid/koha markers in one alternation, walked with a single finditer
+_PRICE_TOKEN_RE = re.compile(
+    r"\$?\s*(?P<num>[0-9]{1,4}(?:\.[0-9]{1,2})?)|(?P<free>\bfree\b)|(?P<paid>\bpaid\b)|(?P<koha>koha|donation)",
+    re.I,
+)
+_PRICE_LABEL_RE = re.compile(r"\bfree\b|\bpaid\b|donation|koha", re.I)
+
+# categories
+_CATEGORY_SPLIT_RE = re.compile(r"[|,]")
+
+# ---------- detail-page tree ----------
+# One parser for every detail page (callbacks all run on the reactor thread). Same
+# options parsel uses, minus the id -> element table that no XPath here reads.
+_HTML_PARSER = HTMLParser(recover=True, encoding="utf-8", huge_tree=True, collect_ids=False, no_network=True)
+
+
+def _html_root(response) -> etree._Element:
+    """lxml root of a detail page, parsed the way parsel would but with the shared parser."""
+    body = response.text.strip().replace("\x00", "").encode("utf-8") or b"<html/>"
+    root = etree.fromstring(body, parser=_HTML_PARSER, base_url=response.url)
+    if root is None:
+        root = etree.fromstring(b"<html/>", parser=_HTML_PARSER, base_url=response.url)
+    return root
+
+
+# ---------- compiled XPaths (evaluated on the detail-page root) ----------
+_XP_EVENT_INFO = etree.XPath("//*[normalize-space()='Event info']/following-sibling::*[1]//text()")
+# Last non-empty text node immediately preceding the first H1; later H1s are never read
+_XP_EYEBROW = etree.XPath("(//h1)[1]/preceding::text()[normalize-space()][1]")
+_XP_CATEGORY_PILLS = etree.XPath(
+    "//*[contains(@class, 'category')]//a/text()"
+    " | //*[contains(concat(' ', normalize-space(@class), ' '), ' tags ')]//a/text()"
+)
+# $h is the lowercased heading text, e.g. "pricing"
+_XP_BLOCK_AFTER_HEADING = etree.XPath(
+    "//*[self::h2 or self::h3 or self::h4]"
+    "[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), $h)]"
+    "/following-sibling::*[1]//text()"
+)
+# Translations of the detail-page CSS selectors, compiled once instead of per response.css() call
+_XP_TIME = etree.XPath("//time/text()")
+_XP_BODY_FIELD_TEXT = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' field--name-body ')]//p/text()"
+    " | //*[contains(concat(' ', normalize-space(@class), ' '), ' field--name-body ')]//li/text()"
+)
+_XP_PARAGRAPHS = etree.XPath("//article//p/text() | //main//p/text() | //section//p/text()")
+_XP_META_DESC = etree.XPath("(//meta[@name='description']/@content)[1]")
+# dd.space-y-0\.5 is a subset of dd[class*="space-y-0.5"], so one test covers both
+_XP_ADDRESS_BITS = etree.XPath("//dd[contains(@class, 'space-y-0.5')]//p/text()")
+_XP_IMAGE = etree.XPath("(//article//img/@src | //main//img/@src)[1]")
+_XP_SUBHEADINGS = etree.XPath("//*[self::h2 or self::h3 or self::h4]")
+# normalize-space() and translate() above only fold XML whitespace and ASCII case
+_XML_WS_RE = re.compile(r"[ \t\r\n]+")
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _parse_dates(text: str | None) -> tuple[str | None, str | None]:
+    """
+    Parse either "15 Dec 2025 | 6:00 pm - 7:30 pm",
+    or "3 - 8 March 2026", or "15 Dec 2025".
+    """
+    if not text:
+        return None, None
+    # Normalise first so equal-looking strings share one cache entry
+    return _parse_dates_norm(_WS_RE.sub(" ", text.replace("–", "-")).strip())
+
+
+# Series pages repeat the same date line, so results are memoised per string
+@functools.lru_cache(maxsize=4096)
+def _parse_dates_norm(t: str) -> tuple[str | None, str | None]:
+    # Full day with start-end time
+    m = _DATE_TIMES_RE.match(t) if "|" in t else None
+    if m:
+        d, mon, y, st_txt, en_txt = m.groups()
+        M = _MONTHS.get(mon[:3].lower())
+        if M:
+            def _hm(s_txt: str) -> str:
+                hh, mm, ap = _HM_RE.match(s_txt).groups()
+                hh, mm = int(hh), int(mm)
+                if ap.lower() == "pm" and hh != 12: hh += 12
+                if ap.lower() == "am" and hh == 12: hh = 0
+                return f"{hh:02d}:{mm:02d}:00"
+            y = int(y); d = int(d)
+            return (f"{y:04d}-{M:02d}-{d:02d}T{_hm(st_txt)}",
+                    f"{y:04d}-{M:02d}-{d:02d}T{_hm(en_txt)}")
+
+    # Date range (no times)
+    m = _DATE_RANGE_RE.match(t) if "-" in t else None
+    if m:
+        d1, d2, mon, y = m.groups()
+        M = _MONTHS.get(mon[:3].lower())
+        if M:
+            y = int(y); d1 = int(d1); d2 = int(d2)
+            return (f"{y:04d}-{M:02d}-{d1:02d}",
+                    f"{y:04d}-{M:02d}-{d2:02d}")
+
+    # Single date
+    m = _DATE_SINGLE_RE.match(t)
+    if m:
+        d, mon, y = m.groups()
+        M = _MONTHS.get(mon[:3].lower())
+        if M:
+            y = int(y); d = int(d)
+            iso = f"{y:04d}-{M:02d}-{d:02d}"
+            return iso, iso
+
+    return None, None
+
+
+# Pricing blocks repeat across a listing ("Free event", "$25", ...); memoised per string
+@functools.lru_cache(maxsize=1024)
+def _normalize_price_text(text: str | None) -> str | None:
+    if not text:
+        return None
+    t = " ".join(text.split())
+
+    # One scan: collect amounts and note which label words appear
+    vals = []
+    saw_decimal = has_free = has_paid = has_koha = False
+    for m in _PRICE_TOKEN_RE.finditer(t):
+        n = m.group("num")
+        if n is not None:
+            if "." in n:
+                saw_decimal = True
+                vals.append(float(n))
+            else:
+                vals.append(int(n))
+        elif m.group("free"):
+            has_free = True
+        elif m.group("paid"):
+            has_paid = True
+        else:
+            has_koha = True
+
+    if vals:
+        has_dollar = "$" in t
+        lo, hi = min(vals), max(vals)
+
+        def fmt(v: float) -> str:
+            if saw_decimal and not float(v).is_integer():
+                return f"{v:.2f}"
+            return f"{int(v)}"
+
+        if lo != hi:
+            return (f"${fmt(lo)} - ${fmt(hi)}") if has_dollar else f"{fmt(lo)} - {fmt(hi)}"
+        return (f"${fmt(lo)}") if has_dollar else f"{fmt(lo)}"
+
+    # Otherwise keep meaningful tokens
+    if has_free:
+        return "Free event"
+    if has_paid:
+        return "Paid event"
+    if has_koha:
+        return "Donation/koha"
+    return t or None
+
+
 class ChristchurchEventsSpider(scrapy.Spider):
     """
     ChristchurchNZ 'What's On' events.
     """
     name = "christchurch_things_to_do"
 
+    # Title candidates in priority order. Tried one by one after _clean, since an
+    # NBSP-only <h1> passes XPath's normalize-space() but cleans to nothing.
+    _XP_TITLES = (
+        etree.XPath("(//h1/text()[normalize-space()])[1]"),
+        etree.XPath("(//meta[@property='og:title']/@content)[1]"),
+        etree.XPath("(//title/text())[1]"),
+    )
+    # Image fallback chain as one XPath. The later branch is guarded by "the
+    # earlier one found nothing", so document order cannot break the priority.
+    _XP_IMAGE_META = etree.XPath(
+        "(//meta[@property='og:image']/@content[normalize-space()]"
+        " | //meta[@name='twitter:image'][not(//meta[@property='og:image']/@content[normalize-space()])]"
+        "/@content[normalize-space()]"
+        ")[1]"
+    )
+    # [matching anchor count, raw hrefs not returned by an earlier call on this page].
+    # The seen-set lives in the page, so each load-more round ships only new links,
+    # and the count for the next round's wait comes back in the same round-trip.
+    _JS_HARVEST = """(sel) => {
+        const seen = window.__tsSeenHrefs || (window.__tsSeenHrefs = new Set());
+        const anchors = document.querySelectorAll(sel);
+        const out = [];
+        for (const a of anchors) {
+            const h = a.getAttribute('href');
+            if (h && !seen.has(h)) { seen.add(h); out.push(h); }
+        }
+        return [anchors.length, out];
+    }"""
+    # One load-more round in the page: scroll to the bottom, click the first visible
+    # load-more control and, only if one was clicked, wait (up to `timeout` ms) for
+    # more matching anchors than `n`. `more` is [[css, lowercased has-text or null], ...].
+    # Returns [clicked, indexes of `more` entries querySelectorAll rejected].
+    _JS_LOAD_MORE = """async ([more, sel, n, timeout]) => {
+        window.scrollTo(0, document.body.scrollHeight);
+        let clicked = false;
+        const invalid = [];
+        outer: for (let i = 0; i < more.length; i++) {
+            const [css, text] = more[i];
+            let els;
+            try { els = document.querySelectorAll(css); } catch (e) { invalid.push(i); continue; }
+            for (const el of els) {
+                if (text !== null && !el.textContent.replace(/\\s+/g, ' ').toLowerCase().includes(text)) continue;
+                if (!el.getClientRects().length || getComputedStyle(el).visibility === 'hidden') continue;
+                el.click();
+                clicked = true;
+                break outer;
+            }
+        }
+        if (clicked) {
+            const deadline = Date.now() + timeout;
+            while (document.querySelectorAll(sel).length <= n && Date.now() < deadline) {
+                await new Promise((r) => setTimeout(r, 100));
+            }
+        }
+        return [clicked, invalid];
+    }"""
+
     custom_settings = {
         "ROBOTSTXT_OBEY": True,
         "DOWNLOAD_TIMEOUT": 60,
-        "DUPEFILTER_CLASS": "scrapy.dupefilters.RFPDupeFilter",
+        # _seen already dedupes detail URLs; skip a second fingerprint per request
+        "DUPEFILTER_CLASS": "scrapy.dupefilters.BaseDupeFilter",
+        # Listing harvest only needs markup and JS: skip images/fonts/media and analytics
+        "PLAYWRIGHT_ABORT_REQUEST": "tscraper.utils.should_abort_request",
     }
 
     # ---------- init & config ----------
@@ -39,6 +296,7 @@ class ChristchurchEventsSpider(scrapy.Spider):
         pages: str | None = None,
         sitemap: str = "https://www.christchurchnz.com/sitemap.xml",
         js_listing: str = "true",
+        omit: str | None = None,
         *args, **kwargs,
     ):
         super().__init__(*args, **kwargs)
@@ -49,9 +307,18 @@ class ChristchurchEventsSpider(scrapy.Spider):
         self.base = base.rstrip("/")
         self.domain = domain
         self.allow_re = re.compile(allow)
+        self._allow_match = self.allow_re.match  # bound once; called for every candidate href
         self.anchor_selector = anchor_selector
         self.linksel = linksel
+        # Translated once; the listing loop re-queries it every load-more round
+        self._link_xpath = css2xpath(linksel)
+        # Same anchors as plain CSS (no ::attr) for querySelectorAll in the page
+        self._link_css = element_selector(linksel)
         self.js_listing = str(js_listing).strip().lower() != "false"
+        # -a omit=description,price,... : emit those fields as None and skip extracting them
+        self.omit = frozenset(f.strip().lower() for f in (omit or "").split(",") if f.strip())
+        # One timestamp per crawl: every item belongs to the same collection run
+        self._updated_at = utc_stamp()
 
         self.more_selectors = [s.strip() for s in (more or "").split("||") if s.strip()] or [
             "button:has-text('Load more')",
@@ -61,6 +328,10 @@ class ChristchurchEventsSpider(scrapy.Spider):
             "a:has-text('Load more')",
             "[data-drupal-views-infinite-scroll] button",
         ]
+        self._more_js = [
+            [m.group(1) or "*", m.group(3).lower()] if (m := _HAS_TEXT_RE.match(s)) else [s, None]
+            for s in self.more_selectors
+        ]
 
         try:
             self.load_more = max(0, int(str(load_more).strip()))
@@ -69,14 +340,21 @@ class ChristchurchEventsSpider(scrapy.Spider):
 
         self.page_range = None
         if pages:
-            m = re.match(r"^\s*(\d+)\s*-\s*(\d+)\s*$", str(pages))
+            m = _PAGES_RE.match(str(pages))
             if m:
                 a, b = int(m.group(1)), int(m.group(2))
                 if b >= a:
                     self.page_range = list(range(a, b + 1))
 
+        base_parts = urlsplit(self.base)
+        self._origin = f"{base_parts.scheme}://{base_parts.netloc}"
+        # Every detail URL sits below the listing path; a substring test rejects the rest cheaply
+        self._section_marker = base_parts.path.rstrip("/") + "/"
         self.sitemap_url = sitemap or self._default_sitemap(self.base)
-        self._seen: set[str] = set()
+        # 16-byte blake2b digests of detail URLs already scheduled (far smaller than the URL strings)
+        self._seen: set[bytes] = set()
+        # Raw hrefs already normalized; paged listings and the sitemap repeat most of them
+        self._seen_href: set[str] = set()
 
         self.start_urls = [self.base]
         self.allowed_domains = [self.domain, f"www.{self.domain}"]
@@ -87,188 +365,130 @@ class ChristchurchEventsSpider(scrapy.Spider):
         return urlunsplit((parts.scheme, parts.netloc, "/sitemap.xml", "", ""))
 
     # ---------- helpers ----------
+    @staticmethod
+    def _key(url: str) -> bytes:
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
     @staticmethod
     def _clean(s: str | None) -> str | None:
         if not s:
             return None
-        s = re.sub(r"\s+", " ", s).strip()
-        return s or None
+        # str.split() collapses and trims whitespace in one C-level pass
+        return " ".join(s.split()) or None
 
     @staticmethod
     def _join_text(nodes) -> str | None:
-        parts = [re.sub(r"\s+", " ", (x or "")).strip() for x in (nodes or [])]
-        parts = [p for p in parts if p]
-        return " ".join(parts) if parts else None
+        return " ".join(w for x in (nodes or []) if x for w in x.split()) or None
 
     def _normalize_detail_url(self, href: str) -> str | None:
         if not href:
             return None
-        absu = urljoin(self.base, href)
-        scheme, netloc, path, _, _ = urlsplit(absu)
-        if not scheme or not netloc or not path:
+        if href.startswith(("/", "http://", "https://")) and not href.startswith("//") and "/." not in href:
+            # Root-relative or absolute without dot segments: strip query/fragment by hand
+            u = self._origin + href if href[0] == "/" else href
+            clean = u.partition("?")[0].partition("#")[0].rstrip("/")
+        else:
+            absu = urljoin(self.base, href)
+            scheme, netloc, path, _, _ = urlsplit(absu)
+            if not scheme or not netloc or not path:
+                return None
+            clean = urlunsplit((scheme, netloc, path.rstrip("/"), "", ""))
+        if self._section_marker not in clean:
             return None
-        clean = urlunsplit((scheme, netloc, path.rstrip("/"), "", ""))
-        # exclude the hub itself and obvious non-detail paths
-        if re.search(r"/visit/whats-on/?$", clean):
+        # exclude the hub itself (trailing slash already stripped) and obvious non-detail paths
+        if clean.endswith("/visit/whats-on"):
             return None
-        if re.search(r"/visit/whats-on/(category|categories|tags?|search|page/|filters|series|venues|authors?)(/|$)", clean):
+        if clean.partition("/visit/whats-on/")[2].partition("/")[0] in _NON_DETAIL_SEGMENTS:
             return None
-        return clean if self.allow_re.match(clean) else None
-
-    def _parse_dates(self, text: str | None) -> tuple[str | None, str | None]:
-        """
-        Parse either "15 Dec 2025 | 6:00 pm - 7:30 pm",
-        or "3 - 8 March 2026", or "15 Dec 2025".
-        """
-        if not text:
-            return None, None
-        t = re.sub(r"\s+", " ", text.replace("–", "-")).strip()
-
-        # Full day with start-end time
-        m = re.match(
-            r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})\s*\|\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))\s*-\s*([0-9]{1,2}:[0-9]{2}\s*(?:am|pm))$",
-            t, re.I
-        )
-        if m:
-            d, mon, y, st_txt, en_txt = m.groups()
-            months = {
-                "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-                "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-                "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-            }
-            M = months.get(mon.lower())
-            if M:
-                def _hm(s_txt: str) -> str:
-                    hh, mm, ap = re.match(r"^\s*(\d{1,2}):(\d{2})\s*(am|pm)\s*$", s_txt, re.I).groups()
-                    hh, mm = int(hh), int(mm)
-                    if ap.lower() == "pm" and hh != 12: hh += 12
-                    if ap.lower() == "am" and hh == 12: hh = 0
-                    return f"{hh:02d}:{mm:02d}:00"
-                y = int(y); d = int(d)
-                return (f"{y:04d}-{M:02d}-{d:02d}T{_hm(st_txt)}",
-                        f"{y:04d}-{M:02d}-{d:02d}T{_hm(en_txt)}")
-
-        # Date range (no times)
-        m = re.match(r"^\s*(\d{1,2})\s*-\s*(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})\s*$", t)
-        if m:
-            d1, d2, mon, y = m.groups()
-            months = {
-                "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-                "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-                "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-            }
-            M = months.get(mon.lower())
-            if M:
-                y = int(y); d1 = int(d1); d2 = int(d2)
-                return (f"{y:04d}-{M:02d}-{d1:02d}",
-                        f"{y:04d}-{M:02d}-{d2:02d}")
-
-        # Single date
-        m = re.match(r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})$", t)
-        if m:
-            d, mon, y = m.groups()
-            months = {
-                "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-                "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-                "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-            }
-            M = months.get(mon.lower())
-            if M:
-                y = int(y); d = int(d)
-                iso = f"{y:04d}-{M:02d}-{d:02d}"
-                return iso, iso
+        return clean if self._allow_match(clean) else None
+
+    def _new_detail_urls(self, hrefs) -> list[str]:
+        """Normalize a batch of hrefs and return the detail URLs not scheduled yet."""
+        new = []
+        seen_href = self._seen_href
+        for h in hrefs:
+            # A repeated href normalizes to a URL already in _seen (or to None): skip it unparsed
+            if h in seen_href:
+                continue
+            seen_href.add(h)
+            u = self._normalize_detail_url(h)
+            if u and (k := self._key(u)) not in self._seen:
+                self._seen.add(k)
+                new.append(u)
+        return new
 
-        return None, None
+    @staticmethod
+    def _time_text(root) -> str:
+        """Joined text of every <time> in the parsed document (not in scripts or comments)."""
+        return " ".join(_XP_TIME(root))
 
-    def _event_info_text(self, response: scrapy.http.Response) -> str | None:
+    def _event_info_text(self, response: scrapy.http.Response, root) -> str | None:
         """Text that follows the 'Event info' label, when <time> is missing."""
-        txt = self._clean(" ".join(
-            response.xpath("//*[normalize-space()='Event info']/following-sibling::*[1]//text()").getall()
-        ))
-        if txt and re.search(r"\d{1,2}\s+[A-Za-z]{3,9}\s+(?:19|20)\d{2}", txt):
+        if not _EVENT_INFO_HINT_RE.search(response.body):
+            return None
+        txt = self._clean(" ".join(_XP_EVENT_INFO(root)))
+        if txt and _DAY_MON_YEAR_RE.search(txt):
             return txt
         return None
 
-    def _eyebrow_categories(self, response: scrapy.http.Response) -> list[str] | None:
+    def _eyebrow_categories(self, root) -> list[str] | None:
         """
         The small 'eyebrow' just above <h1>, e.g. 'Central City | Festival'.
         Split on '|' or ',' and return a clean list.
         """
-        # Last non-empty text node immediately preceding the H1
-        t = response.xpath("(//h1/preceding::text()[normalize-space()][1])").get()
+        t = next(iter(_XP_EYEBROW(root)), None)
         t = self._clean(t)
         if t and ("|" in t or "," in t):
-            parts = [self._clean(p) for p in re.split(r"[|,]", t)]
+            parts = [self._clean(p) for p in _CATEGORY_SPLIT_RE.split(t)]
             parts = [p for p in parts if p and p.lower() not in ("home", "visit", "whats on", "what's on")]
             return parts or None
 
         # Fallback: pill/label classes
-        pills = [self._clean(x) for x in response.css("[class*='category'] a::text, .tags a::text").getall()]
+        pills = [self._clean(x) for x in _XP_CATEGORY_PILLS(root)]
         return [p for p in pills if p] or None
 
-    def _pricing_text(self, response: scrapy.http.Response) -> str | None:
+    def _pricing_text(self, response: scrapy.http.Response, root) -> str | None:
         """
         Prefer the explicit 'Pricing' section, e.g. '$59.90 - $299.00'.
         Fallback to 'Ticket pricing' (Free event / Paid event) if no numbers found.
         """
+        if not _PRICING_HINT_RE.search(response.body):
+            return None
+
         # 1) Heading 'Pricing' or 'Ticket pricing' -> next block
+        # Read the h2-h4 texts once, folded the way the XPath folds them, and only
+        # run the block query for headings that are actually on the page
+        heads = " | ".join(_XML_WS_RE.sub(" ", e.text_content()).translate(_ASCII_LOWER) for e in _XP_SUBHEADINGS(root))
+
         def block_after(*headings: str) -> str | None:
-            up = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            low = "abcdefghijklmnopqrstuvwxyz"
             for h in headings:
-                sel = (f"//*[self::h2 or self::h3 or self::h4]"
-                       f"[contains(translate(normalize-space(.), '{up}', '{low}'), '{h.lower()}')]/"
-                       f"following-sibling::*[1]//text()")
-                t = self._clean(" ".join(response.xpath(sel).getall()))
+                h = h.lower()
+                if h not in heads:
+                    continue
+                t = self._clean(" ".join(_XP_BLOCK_AFTER_HEADING(root, h=h)))
                 if t:
                     return t
             return None
 
         txt = block_after("Pricing")
-        if txt and re.search(r"\$\s*\d", txt):
+        if txt and _DOLLAR_AMOUNT_RE.search(txt):
             return txt
 
         # 2) Ticket pricing (Paid/Free)
         txt2 = block_after("Ticket pricing", "Ticket price", "Admission")
         return txt2 or None
 
-    @staticmethod
-    def _normalize_price_text(text: str | None) -> str | None:
-        if not text:
-            return None
-        t = re.sub(r"\s+", " ", text).strip()
-
-        # Look for explicit $, capture decimals if present so we can format nicely
-        raw_nums = re.findall(r"\$?\s*([0-9]{1,4}(?:\.[0-9]{1,2})?)", t)
-        has_dollar = "$" in t
-        if raw_nums:
-            vals = []
-            saw_decimal = any("." in n for n in raw_nums)
-            for n in raw_nums:
-                try:
-                    vals.append(float(n))
-                except Exception:
-                    pass
-            if vals:
-                lo, hi = min(vals), max(vals)
-
-                def fmt(v: float) -> str:
-                    if saw_decimal and not float(v).is_integer():
-                        return f"{v:.2f}"
-                    return f"{int(v)}"
-
-                if lo != hi:
-                    return (f"${fmt(lo)} - ${fmt(hi)}") if has_dollar else f"{fmt(lo)} - {fmt(hi)}"
-                return (f"${fmt(lo)}") if has_dollar else f"{fmt(lo)}"
-
-        # Otherwise keep meaningful tokens
-        if re.search(r"\bfree\b", t, re.I):
-            return "Free event"
-        if re.search(r"\bpaid\b", t, re.I):
-            return "Paid event"
-        if re.search(r"koha|donation", t, re.I):
-            return "Donation/koha"
-        return t or None
+    def _dt_location(self, root) -> str | None:
+        """<dd> after a 'Location'/'Venue' <dt>; one walk over <dt>, case-folded in Python."""
+        dds = []
+        for dt in root.iter("dt"):
+            low = dt.text_content().lower()
+            if "location" not in low and "venue" not in low:
+                continue
+            dd = next(dt.itersiblings("dd"), None)
+            if dd is not None and dd not in dds:
+                dds.append(dd)
+        return self._clean(" ".join(t for dd in dds for t in dd.xpath(".//text()")))
 
     # ---------- crawling ----------
     def start_requests(self):
@@ -285,7 +505,7 @@ class ChristchurchEventsSpider(scrapy.Spider):
                     yield scrapy.Request(
                         url,
                         callback=self.parse_listing_with_playwright,
-                        meta={"playwright": True, "playwright_include_page": True},
+                        meta={"playwright": True, "playwright_include_page": True, "listing_page": n},
                         dont_filter=True,
                     )
         else:
@@ -306,139 +526,138 @@ class ChristchurchEventsSpider(scrapy.Spider):
             pass
 
         # 1st harvest
-        html = await page.content()
-        sel = Selector(text=html)
-        for h in sel.css(self.linksel).getall():
-            u = self._normalize_detail_url(h)
-            if u and u not in self._seen:
-                self._seen.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        prev, hrefs = await self._harvest(page)
+        for u in self._new_detail_urls(hrefs):
+            yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+
+        # ?page=N renders one fixed slice: harvest it and free the page so the
+        # other paged listings run side by side; only the base URL scrolls
+        if response.meta.get("listing_page") is not None:
+            await page.close()
+            return
 
         # Try virtual/infinite loading politely
-        stagnant = 0
-        for _ in range(self.load_more):
+        for rounds in range(self.load_more):
+            # Scroll, click and settle in one round-trip; harvest right after so the
+            # new detail requests start while the next round loads
             try:
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            except Exception:
-                pass
-            await page.wait_for_timeout(700)
-
-            clicked = False
-            for s in self.more_selectors:
-                try:
-                    loc = page.locator(s).first
-                    if await loc.is_visible():
-                        await loc.click()
-                        clicked = True
-                        try:
-                            await page.wait_for_load_state("networkidle", timeout=5000)
-                        except Exception:
-                            await page.wait_for_timeout(1200)
-                        break
-                except Exception:
-                    continue
+                clicked, invalid = await page.evaluate(
+                    self._JS_LOAD_MORE, [self._more_js, self._link_css, prev, 3000]
+                )
+            except Exception as e:
+                self.logger.warning("Load-more round failed on %s: %s", response.url, e)
+                clicked, invalid = False, []
+            if invalid:
+                self._drop_more_selectors(invalid)
+            prev, hrefs = await self._harvest(page)
+            for u in self._new_detail_urls(hrefs):
+                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
 
-            html = await page.content()
-            sel = Selector(text=html)
-            new = 0
-            for h in sel.css(self.linksel).getall():
-                u = self._normalize_detail_url(h)
-                if u and u not in self._seen:
-                    self._seen.add(u)
-                    new += 1
-                    yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
-
-            stagnant = 0 if new else (stagnant + 1)
-            if not clicked and stagnant >= 3:
+            if not clicked:
+                self.logger.info(
+                    "No visible load-more control on %s after %d round(s); stopping", response.url, rounds + 1
+                )
                 break
 
         await page.close()
 
+    def _drop_more_selectors(self, indexes) -> None:
+        """Warn about load-more selectors the page's querySelectorAll rejected and stop trying them."""
+        bad = set(indexes)
+        self.logger.warning(
+            "Ignoring load-more selectors querySelectorAll rejects (e.g. text=, xpath=): %s",
+            [s for i, s in enumerate(self.more_selectors) if i in bad],
+        )
+        self.more_selectors = [s for i, s in enumerate(self.more_selectors) if i not in bad]
+        self._more_js = [m for i, m in enumerate(self._more_js) if i not in bad]
+
+    async def _harvest(self, page) -> tuple[int, list[str]]:
+        """(matching anchor count, new raw hrefs) in one round-trip."""
+        try:
+            count, hrefs = await page.evaluate(self._JS_HARVEST, self._link_css)
+            return count, hrefs
+        except Exception:
+            return 0, []
+
     def parse_listing(self, response: scrapy.http.Response):
-        for h in response.css(self.linksel).getall():
-            u = self._normalize_detail_url(h)
-            if u and u not in self._seen:
-                self._seen.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        for u in self._new_detail_urls(response.xpath(self._link_xpath).getall()):
+            yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
 
     def parse_sitemap_index(self, response: scrapy.http.Response):
-        for loc in response.xpath("//loc/text()").getall():
+        pages = []
+        for loc in iter_sitemap_locs(response.body):
             if loc.endswith(".xml"):
                 yield scrapy.Request(loc, callback=self.parse_sitemap_leaf, dont_filter=True)
             else:
-                u = self._normalize_detail_url(loc)
-                if u and u not in self._seen:
-                    self._seen.add(u)
-                    yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+                pages.append(loc)
+        for u in self._new_detail_urls(pages):
+            yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
 
     def parse_sitemap_leaf(self, response: scrapy.http.Response):
-        for loc in response.xpath("//url/loc/text()").getall():
-            u = self._normalize_detail_url(loc)
-            if u and u not in self._seen:
-                self._seen.add(u)
-                yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
+        for u in self._new_detail_urls(iter_sitemap_locs(response.body)):
+            yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
 
     # ---------- detail pages ----------
     def parse_event(self, response: scrapy.http.Response):
         # Title
-        title = self._clean(response.css("h1::text").get()) \
-            or self._clean(response.css("meta[property='og:title']::attr(content)").get()) \
-            or self._clean(response.css("title::text").get())
+        root = _html_root(response)
+        title = None
+        for xp in self._XP_TITLES:
+            title = self._clean(next(iter(xp(root)), None))
+            if title:
+                break
+
+        omit = self.omit
 
         # Description (best-effort)
-        desc = self._join_text(response.css(".field--name-body p::text, .field--name-body li::text").getall()) \
-            or self._join_text(response.css("article p::text, main p::text, section p::text").getall()) \
-            or self._clean(response.css("meta[name='description']::attr(content)").get())
+        desc = None
+        if "description" not in omit:
+            desc = self._join_text(_XP_BODY_FIELD_TEXT(root)) \
+                or self._join_text(_XP_PARAGRAPHS(root)) \
+                or self._clean(next(iter(_XP_META_DESC(root)), None))
 
         # --- Categories (eyebrow above H1) ---
-        categories = self._eyebrow_categories(response)
+        categories = None if "categories" in omit else self._eyebrow_categories(root)
 
         # --- Date/time ---
-        time_text = self._clean(" ".join(response.css("time::text").getall()))
-        if not (time_text and re.search(r"\d", time_text)):
-            time_text = self._event_info_text(response)
-        st, en = self._parse_dates(time_text)
+        time_text = self._clean(self._time_text(root))
+        if not (time_text and _DIGIT_RE.search(time_text)):
+            time_text = self._event_info_text(response, root)
+        st, en = _parse_dates(time_text)
 
         # --- Pricing ---
-        raw_price = self._pricing_text(response)
-        price = self._normalize_price_text(raw_price)
+        price = None if "price" in omit else _normalize_price_text(self._pricing_text(response, root))
 
-        # --- Location ---
+        yield {
+            "source": self.domain.split(".")[0],
+            "url": response.url,
+            "title": title,
+            "description": desc,
+            "dates": {"start": st, "end": en, "text": time_text},
+            "price": price,
+            "location": None if "location" in omit else self._location(root),
+            "categories": categories or None,
+            "image": None if "image" in omit else self._image(response, root),
+            "updated_at": self._updated_at,
+        }
+
+    def _location(self, root) -> str:
         # Prefer explicit address-style blocks, never “Free/Paid event”
-        loc_bits = [self._clean(t) for t in response.css('dd.space-y-0\\.5 p::text, dd[class*="space-y-0.5"] p::text').getall()]
+        loc_bits = [self._clean(t) for t in _XP_ADDRESS_BITS(root)]
         loc_bits = [b for b in loc_bits if b]
         location = " | ".join(loc_bits) if loc_bits else None
         if not location:
             # dt=Location/Venue -> dd
-            location = self._clean(" ".join(
-                response.xpath(
-                    "//dt[contains(translate(., 'LOCATIONVENUE', 'locationvenue'), 'location') or "
-                    "contains(translate(., 'LOCATIONVENUE', 'locationvenue'), 'venue')]/following-sibling::dd[1]//text()"
-                ).getall()
-            ))
+            location = self._dt_location(root)
         # filter out tokens that are actually pricing labels
-        if location and re.search(r"\bfree\b|\bpaid\b|donation|koha", location, re.I):
+        if location and _PRICE_LABEL_RE.search(location):
             location = None
-        if not location:
-            location = "See website for details"
+        return location or "See website for details"
 
-        # --- Image ---
-        image = response.css("meta[property='og:image']::attr(content)").get() \
-            or response.css("meta[name='twitter:image']::attr(content)").get()
+    def _image(self, response: scrapy.http.Response, root) -> str | None:
+        image = next(iter(self._XP_IMAGE_META(root)), None)
         if not image:
-            img = response.css("article img::attr(src), main img::attr(src)").get()
+            img = next(iter(_XP_IMAGE(root)), None)
             if img:
                 image = urljoin(response.url, img)
-
-        yield {
-            "source": self.domain.split(".")[0],
-            "url": response.url,
-            "title": title,
-            "description": desc,
-            "dates": {"start": st, "end": en, "text": time_text},
-            "price": price,
-            "location": location,
-            "categories": categories or None,
-            "image": image,
-            "updated_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
-        }
+        return image
@@ -2,8 +2,9 @@ import re
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import scrapy
+from lxml import etree
 from tscraper.items import TravelScoutItem, make_id
-from tscraper.utils import clean, parse_date_range, parse_prices, build_embedding_text
+from tscraper.utils import clean, parse_prices
 
 BASE = "https://www.christchurchnz.com"
 ROOT = f"{BASE}/visit/whats-on/"
@@ -11,10 +12,58 @@ ROOT = f"{BASE}/visit/whats-on/"
 # match only detail pages:
 #   /visit/whats-on/listing/<slug-or-slug-id>
 #   /visit/whats-on/<slug>
-EVENT_PATH_RE = re.compile(
-    r"^/visit/whats-on/(?:listing/)?(?!subscribe|search|categories|category|tag|about|contact|news|events/?$)[a-z0-9\-]+(?:-\d+)?/?$",
-    re.I,
+EVENT_PREFIX = "/visit/whats-on/"
+# Slugs starting with any of these are section pages, not events ("events" itself too)
+DENY_SLUG_PREFIXES = ("subscribe", "search", "categories", "category", "tag", "about", "contact", "news")
+SLUG_RE = re.compile(r"[a-z0-9\-]+", re.I)
+
+
+def _is_event_slug(seg: str) -> bool:
+    if seg.endswith("/"):
+        seg = seg[:-1]
+    if not SLUG_RE.fullmatch(seg):
+        return False
+    low = seg.lower()
+    return low != "events" and not low.startswith(DENY_SLUG_PREFIXES)
+
+
+def _is_event_path(path: str) -> bool:
+    """Prefix test, then one slug check; same paths as the old lookahead regex, without backtracking."""
+    if path[:16].lower() != EVENT_PREFIX:
+        return False
+    rest = path[16:]
+    if rest[:8].lower() == "listing/" and _is_event_slug(rest[8:]):
+        return True
+    return _is_event_slug(rest)
+
+# Every anchor href (listing and related links); replaces response.css("a::attr(href)")
+XP_HREFS = etree.XPath("//a/@href")
+
+# Detail-page XPaths, compiled once and evaluated on response.selector.root
+XP_NAME = etree.XPath("//h1/text()")
+XP_DESC = etree.XPath("(//h1/following::p)[1]//text()")
+XP_DATE = etree.XPath("//*[contains(., 'Event info')]/following::*[1]//text()")
+XP_DATE_FALLBACK = etree.XPath("//*[contains(., 'Event info')]//text()")
+XP_ADDRESS = etree.XPath("//*[normalize-space()='Address']/following::*[1]//text()")
+XP_TICKET = etree.XPath(
+    "//a[contains(translate(., 'TICKET', 'ticket'),'ticket') or contains(translate(., 'BUY', 'buy'),'buy')]/@href"
 )
+XP_SITE = etree.XPath("//a[contains(.,'View website')]/@href")
+XP_PRICE = etree.XPath("//*[contains(., 'Ticket pricing') or contains(., 'Pricing')]/following::*[1]//text()")
+XP_PRICE_FALLBACK = etree.XPath("//p[contains(.,'$') or contains(.,'Free') or contains(.,'free')]//text()")
+XP_IMG = etree.XPath("//img[contains(@src,'.jpg') or contains(@src,'.jpeg') or contains(@src,'.png')]/@src")
+
+
+# Raw-body checks for the label XPaths below. Each contains(.)/normalize-space() test
+# builds the string value of every element on the page, so it only runs when the
+# label text is in the body at all (two-word labels may be split by tags)
+EVENT_INFO_HINT_RE = re.compile(rb"Event(?:\s|<[^>]*>)*info")
+# XP_PRICE matches 'Pricing' or 'Ticket pricing' (contains() is case-sensitive)
+PRICING_HINT_RE = re.compile(rb"Pricing|Ticket(?:\s|<[^>]*>)*pricing")
+
+
+def _first(results):
+    return results[0] if results else None
 
 
 class ChristchurchWhatsOnSpider(scrapy.Spider):
@@ -27,6 +76,8 @@ class ChristchurchWhatsOnSpider(scrapy.Spider):
     custom_settings = {
         # Extra hard guard per spider (in addition to global)
         "CLOSESPIDER_PAGECOUNT": 4000,
+        # Date parsing + embedding text are finished off the reactor thread
+        "ITEM_PIPELINES": {"tscraper.pipelines.EventPostParsePipeline": 300},
     }
 
     def start_requests(self):
@@ -45,12 +96,17 @@ class ChristchurchWhatsOnSpider(scrapy.Spider):
 
     def parse_listing(self, response: scrapy.http.Response):
         # ONLY push detail pages discovered on these list pages
-        for href in response.css("a::attr(href)").getall():
+        # Cards repeat their link (image, title, "more"); build one Request per URL
+        seen = set()
+        for href in XP_HREFS(response.selector.root):
             if not href or href.startswith("#"):
                 continue
-            url = urljoin(BASE, href)
+            url = urljoin(BASE, href.split("#", 1)[0])
+            if url in seen:
+                continue
+            seen.add(url)
             path = urlparse(url).path
-            if EVENT_PATH_RE.match(path):
+            if _is_event_path(path):
                 yield response.follow(url, callback=self.parse_event)
 
         # Do NOT recursively follow more listing pages here.
@@ -58,44 +114,38 @@ class ChristchurchWhatsOnSpider(scrapy.Spider):
 
     def parse_event(self, response: scrapy.http.Response):
         url = response.url
+        body = response.body
+        root = response.selector.root
 
         # title
-        name = clean(response.xpath("//h1/text()").get())
+        name = clean(_first(XP_NAME(root)))
         if not name:
             return
 
         # Summary
-        desc = clean(" ".join(response.xpath("(//h1/following::p)[1]//text()").getall())) or None
+        desc = clean(" ".join(XP_DESC(root))) or None
 
         # Date/time: works for "17 Nov 2025 | 7:00 pm - 9:30 pm" and "17 - 19 April 2026"
-        date_text = clean(" ".join(
-            response.xpath("//*[contains(., 'Event info')]/following::*[1]//text()").getall()
-        )) or clean(" ".join(
-            response.xpath("//*[contains(., 'Event info')]//text()").getall()
-        ))
-        start_iso, end_iso = parse_date_range(date_text or "")
+        date_text = None
+        if EVENT_INFO_HINT_RE.search(body):
+            date_text = clean(" ".join(XP_DATE(root))) or clean(" ".join(XP_DATE_FALLBACK(root)))
 
         # Address/venue
-        address = clean(" ".join(response.xpath("//*[normalize-space()='Address']/following::*[1]//text()").getall()))
+        address = clean(" ".join(XP_ADDRESS(root))) if b"Address" in body else None
         loc_name = address.split(",")[0].strip() if address and "," in address else None
 
         # Booking / ticket link
-        ticket = response.xpath(
-            "//a[contains(translate(., 'TICKET', 'ticket'),'ticket') or contains(translate(., 'BUY', 'buy'),'buy')]/@href"
-        ).get()
-        site = response.xpath("//a[contains(.,'View website')]/@href").get()
+        ticket = _first(XP_TICKET(root))
+        site = _first(XP_SITE(root))
         booking_url = urljoin(url, ticket or site) if (ticket or site) else None
 
         # Price (Ticket pricing / Pricing block, or $/Free mentions)
-        price_block = clean(" ".join(
-            response.xpath("//*[contains(., 'Ticket pricing') or contains(., 'Pricing')]/following::*[1]//text()").getall()
-        )) or clean(" ".join(
-            response.xpath("//p[contains(.,'$') or contains(.,'Free') or contains(.,'free')]//text()").getall()
-        ))
+        price_block = (clean(" ".join(XP_PRICE(root))) if PRICING_HINT_RE.search(body) else None) \
+            or clean(" ".join(XP_PRICE_FALLBACK(root)))
         price = parse_prices(price_block or "")
 
         # Hero image
-        img = response.xpath("//img[contains(@src,'.jpg') or contains(@src,'.jpeg') or contains(@src,'.png')]/@src").get()
+        img = _first(XP_IMG(root))
         if img and img.startswith("/"):
             img = urljoin(BASE, img)
 
@@ -120,21 +170,33 @@ class ChristchurchWhatsOnSpider(scrapy.Spider):
             },
             price=price,
             booking={"url": booking_url, "email": None, "phone": None},
-            event_dates={"start": start_iso, "end": end_iso, "timezone": "Pacific/Auckland"},
+            # start/end and text_for_embedding are filled by EventPostParsePipeline
+            event_dates={"start": None, "end": None, "timezone": "Pacific/Auckland"},
             opening_hours=None,
             operating_months=None,
             data_collected_at=datetime.now().astimezone().isoformat(),
-            text_for_embedding=build_embedding_text(
-                name, desc, {"address": address, "city": "Christchurch", "region": "Canterbury"},
-                date_text, price.get("text") if price else None, ["Events"]
-            )
+            text_for_embedding=None,
         )
-        yield item.to_dict()
+        yield {
+            **item.to_dict(),
+            "_pending": {
+                "name": name,
+                "description": desc,
+                "location": {"address": address, "city": "Christchurch", "region": "Canterbury"},
+                "date_text": date_text,
+                "price_text": price.get("text") if price else None,
+                "categories": ["Events"],
+            },
+        }
 
         # Optional: follow only *detail* links from this page (not listing)
-        for rel in response.css("a::attr(href)").getall():
+        seen = {url}
+        for rel in XP_HREFS(root):
             if not rel or rel.startswith("#"):
                 continue
-            absu = urljoin(BASE, rel)
-            if EVENT_PATH_RE.match(urlparse(absu).path):
+            absu = urljoin(BASE, rel.split("#", 1)[0])
+            if absu in seen:
+                continue
+            seen.add(absu)
+            if _is_event_path(urlparse(absu).path):
                 yield response.follow(absu, callback=self.parse_event)
@@ -1,11 +1,13 @@
 # scraper/tscraper/spiders/queenstown_events.py
 # -*- coding: utf-8 -*-
 import re
-from datetime import datetime
+import hashlib
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import scrapy
-from parsel import Selector
+from lxml import etree
+
+from tscraper.utils import iter_sitemap_locs, utc_stamp
 
 try:
     from scrapy_playwright.page import PageMethod  # enabled via settings
@@ -13,6 +15,53 @@ except Exception:  # pragma: no cover
     PageMethod = None
 
 
+_MONTHS = {
+    "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
+    "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
+    "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
+}
+
+# Detail-page XPaths, compiled once and evaluated on response.selector.root.
+# Fallback chains are one expression each: every later branch is guarded by
+# "the earlier ones found nothing", so document order cannot break the priority.
+_XP_JSONLD = etree.XPath("//script[@type='application/ld+json']/text()")
+# Title candidates stay separate and are tried after _clean: an NBSP-only <h1>
+# passes XPath's normalize-space() but cleans to nothing.
+_XP_TITLES = (
+    etree.XPath("(//h1/text()[normalize-space()])[1]"),
+    etree.XPath("(//meta[@property='og:title']/@content)[1]"),
+    etree.XPath("(//title/text())[1]"),
+)
+_XP_PARAGRAPHS = etree.XPath("//article//p/text() | //main//p/text()")
+_XP_META_DESC = etree.XPath("(//meta[@name='description']/@content)[1]")
+_XP_TIME = etree.XPath("//time/text()")
+# dd.space-y-0\.5 is a subset of dd[class*="space-y-0.5"], so one test covers both
+_XP_ADDRESS_BITS = etree.XPath("//dd[contains(@class, 'space-y-0.5')]//p/text()")
+_XP_DT_LOCATION = etree.XPath(
+    "//dt[contains(translate(., 'LOCATIONWHERE', 'locationwhere'), 'location') or "
+    "contains(translate(., 'LOCATIONWHERE', 'locationwhere'), 'where')]/following-sibling::dd[1]//text()"
+)
+_XP_DT_PRICE = etree.XPath(
+    "//dt[contains(translate(., 'PRICECOST', 'pricecost'), 'price') or "
+    "contains(translate(., 'PRICECOST', 'pricecost'), 'cost')]/following-sibling::dd[1]//text()"
+)
+_XP_CATEGORIES = etree.XPath(
+    "//*[contains(@class, 'category')]//a/text()"
+    " | //*[contains(concat(' ', normalize-space(@class), ' '), ' tags ')]//a/text()"
+)
+_XP_IMAGE_META = etree.XPath(
+    "(//meta[@property='og:image']/@content[normalize-space()]"
+    " | //meta[@name='twitter:image'][not(//meta[@property='og:image']/@content[normalize-space()])]"
+    "/@content[normalize-space()]"
+    ")[1]"
+)
+_XP_IMAGE = etree.XPath("(//article//img/@src | //main//img/@src)[1]")
+
+
+def _first_str(results):
+    return results[0] if results else None
+
+
 class QueenstownEventsSpider(scrapy.Spider):
     name = "queenstown_events"
     allowed_domains = ["queenstownnz.co.nz", "www.queenstownnz.co.nz"]
@@ -22,6 +71,8 @@ class QueenstownEventsSpider(scrapy.Spider):
         "ROBOTSTXT_OBEY": True,
         "DOWNLOAD_TIMEOUT": 60,
         "DUPEFILTER_CLASS": "scrapy.dupefilters.RFPDupeFilter",
+        # Listing harvest only needs markup and JS: skip images/fonts/media and analytics
+        "PLAYWRIGHT_ABORT_REQUEST": "tscraper.utils.should_abort_request",
     }
 
     # CLI:
@@ -38,12 +89,17 @@ class QueenstownEventsSpider(scrapy.Spider):
             except Exception:
                 self.max_pages = 60
 
-        self._seen: set[str] = set()
+        # 16-byte blake2b digests of event URLs already scheduled (far smaller than the URL strings)
+        self._seen: set[bytes] = set()
 
         # Element selector to “wait for tiles” (Playwright waits need element selectors)
         self.anchor_selector = "a[href^='/event/']"
         # HTML parsing selector to extract hrefs:
         self.linksel = "a[href^='/event/']::attr(href), a[href*='/event/']::attr(href)"
+        # Same anchors as a live-DOM selector (the container scope binds to the first branch only)
+        self._harvest_css = "[data-ts-target=\"events-main\"] " + ", ".join(
+            p.split("::", 1)[0].strip() for p in self.linksel.split(",")
+        )
 
         # Accept /event/<slug>/ or /event/<slug>/<id>/ (allow encoded chars), but exclude non-detail endpoints
         self.allow_re = re.compile(
@@ -59,13 +115,16 @@ class QueenstownEventsSpider(scrapy.Spider):
     def _clean(s: str | None) -> str | None:
         if not s:
             return None
-        return re.sub(r"\s+", " ", s).strip() or None
+        # str.split() collapses and trims whitespace in one C-level pass
+        return " ".join(s.split()) or None
 
     @staticmethod
     def _join_text(nodes) -> str | None:
-        parts = [re.sub(r"\s+", " ", x or "").strip() for x in (nodes or [])]
-        parts = [p for p in parts if p]
-        return " ".join(parts) if parts else None
+        return " ".join(w for x in (nodes or []) if x for w in x.split()) or None
+
+    @staticmethod
+    def _key(url: str) -> bytes:
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
 
     def _normalize_detail_url(self, href: str) -> str | None:
         if not href:
@@ -79,11 +138,11 @@ class QueenstownEventsSpider(scrapy.Spider):
 
     # ---- JSON-LD helpers (for reliable dates/location) ----
     @staticmethod
-    def _jsonld_objects(response_text: str):
+    def _jsonld_objects(root):
+        """JSON-LD blocks of the page, read from the already-parsed response tree."""
         import json
-        sel = Selector(text=response_text or "")
         out = []
-        for node in sel.xpath("//script[@type='application/ld+json']/text()").getall():
+        for node in _XP_JSONLD(root):
             try:
                 data = node.strip()
                 if not data:
@@ -121,6 +180,7 @@ class QueenstownEventsSpider(scrapy.Spider):
         if not text:
             return None, None
         t = re.sub(r"\s+", " ", text).strip()
+        mget = _MONTHS.get
 
         # 15 Dec 2025 | 6:00 pm - 7:30 pm
         m = re.match(
@@ -129,12 +189,7 @@ class QueenstownEventsSpider(scrapy.Spider):
         )
         if m:
             d, mon, y, st_txt, en_txt = m.groups()
-            months = {
-                "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-                "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-                "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-            }
-            M = months.get(mon.lower())
+            M = mget(mon.lower())
             if M:
                 def _hm(s_txt: str) -> str:
                     hh, mm, ap = re.match(r"^\s*(\d{1,2}):(\d{2})\s*(am|pm)\s*$", s_txt, re.I).groups()
@@ -150,12 +205,7 @@ class QueenstownEventsSpider(scrapy.Spider):
         m = re.match(r"^\s*(\d{1,2})\s*-\s*(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\s*$", t)
         if m:
             d1, d2, mon, y = m.groups()
-            months = {
-                "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-                "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-                "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-            }
-            M = months.get(mon.lower())
+            M = mget(mon.lower())
             if M:
                 return (f"{int(y):04d}-{M:02d}-{int(d1):02d}",
                         f"{int(y):04d}-{M:02d}-{int(d2):02d}")
@@ -164,12 +214,7 @@ class QueenstownEventsSpider(scrapy.Spider):
         m = re.match(r"^(\d{1,2})\s+([A-Za-z]{3,9})\s+((?:19|20)\d{2})$", t)
         if m:
             d, mon, y = m.groups()
-            months = {
-                "jan":1,"january":1,"feb":2,"february":2,"mar":3,"march":3,"apr":4,"april":4,
-                "may":5,"jun":6,"june":6,"jul":7,"july":7,"aug":8,"august":8,"sep":9,"sept":9,
-                "september":9,"oct":10,"october":10,"nov":11,"november":11,"dec":12,"december":12,
-            }
-            M = months.get(mon.lower())
+            M = mget(mon.lower())
             if M:
                 iso = f"{int(y):04d}-{M:02d}-{int(d):02d}"
                 return iso, iso
@@ -246,15 +291,18 @@ class QueenstownEventsSpider(scrapy.Spider):
             return ""
 
     async def _harvest_links_now(self, page) -> list[str]:
-        """Parse current DOM inside the container and return fresh, normalized event URLs."""
-        html = await page.content()
-        sel = Selector(text=html)
-        scope = '[data-ts-target="events-main"] '
+        """Read hrefs straight from the live DOM and return fresh, normalized event URLs."""
+        try:
+            hrefs = await page.eval_on_selector_all(
+                self._harvest_css, "els => els.map(e => e.getAttribute('href'))"
+            )
+        except Exception:
+            return []
         out = []
-        for h in sel.css(scope + self.linksel).getall():
+        for h in hrefs:
             u = self._normalize_detail_url(h)
-            if u and u not in self._seen:
-                self._seen.add(u)
+            if u and (k := self._key(u)) not in self._seen:
+                self._seen.add(k)
                 out.append(u)
         return out
 
@@ -387,25 +435,27 @@ class QueenstownEventsSpider(scrapy.Spider):
 
     # ---- sitemap fallbacks ----
     def parse_sitemap_index(self, response):
-        for loc in response.xpath("//loc/text()").getall():
+        for loc in iter_sitemap_locs(response.body):
             if loc.endswith(".xml"):
                 yield scrapy.Request(loc, callback=self.parse_sitemap_leaf, dont_filter=True)
             else:
                 u = self._normalize_detail_url(loc)
-                if u and u not in self._seen:
-                    self._seen.add(u)
+                if u and (k := self._key(u)) not in self._seen:
+                    self._seen.add(k)
                     yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
 
     def parse_sitemap_leaf(self, response):
-        for loc in response.xpath("//url/loc/text()").getall():
+        for loc in iter_sitemap_locs(response.body):
             u = self._normalize_detail_url(loc)
-            if u and u not in self._seen:
-                self._seen.add(u)
+            if u and (k := self._key(u)) not in self._seen:
+                self._seen.add(k)
                 yield scrapy.Request(u, callback=self.parse_event, dont_filter=True)
 
     # ---------------- detail pages ----------------
     def parse_event(self, response: scrapy.http.Response):
-        objs = self._jsonld_objects(response.text)
+        # One parsed tree; every field below is a precompiled XPath over it
+        root = response.selector.root
+        objs = self._jsonld_objects(root)
         ev = self._find_event_jsonld(objs)
 
         # Title
@@ -414,9 +464,10 @@ class QueenstownEventsSpider(scrapy.Spider):
             name = self._first(ev, "name")
             if isinstance(name, str) and name.strip():
                 title = name.strip()
-        title = title or self._clean(response.css("h1::text").get()) \
-            or self._clean(response.css("meta[property='og:title']::attr(content)").get()) \
-            or self._clean(response.css("title::text").get())
+        for xp in _XP_TITLES:
+            if title:
+                break
+            title = self._clean(_first_str(xp(root)))
 
         # Description
         desc = None
@@ -424,8 +475,8 @@ class QueenstownEventsSpider(scrapy.Spider):
             d = self._first(ev, "description")
             if isinstance(d, str) and d.strip():
                 desc = self._clean(d)
-        desc = desc or self._join_text(response.css("article p::text, main p::text").getall()) \
-            or self._clean(response.css("meta[name='description']::attr(content)").get())
+        desc = desc or self._join_text(_XP_PARAGRAPHS(root)) \
+            or self._clean(_first_str(_XP_META_DESC(root)))
 
         # Dates
         st = en = None
@@ -434,10 +485,10 @@ class QueenstownEventsSpider(scrapy.Spider):
             st = self._first(ev, "startDate")
             en = self._first(ev, "endDate")
         if not (st or en):
-            dates_text = self._clean(" ".join(response.css("time::text").getall()))
+            dates_text = self._clean(" ".join(_XP_TIME(root)))
             st, en = self._parse_dates_text(dates_text)
         else:
-            dates_text = dates_text or self._clean(" ".join(response.css("time::text").getall()))
+            dates_text = dates_text or self._clean(" ".join(_XP_TIME(root)))
 
         # Location (JSON-LD first; fallbacks if needed)
         location_text = None
@@ -452,35 +503,24 @@ class QueenstownEventsSpider(scrapy.Spider):
                     if parts:
                         location_text = " | ".join(parts)
         if not location_text:
-            bits = [self._clean(t) for t in response.css('dd.space-y-0\\.5 p::text, dd[class*="space-y-0.5"] p::text').getall()]
+            bits = [self._clean(t) for t in _XP_ADDRESS_BITS(root)]
             bits = [b for b in bits if b]
             if bits:
                 location_text = " | ".join(bits)
         if not location_text:
-            location_text = self._clean(" ".join(
-                response.xpath(
-                    "//dt[contains(translate(., 'LOCATIONWHERE', 'locationwhere'), 'location') or "
-                    "contains(translate(., 'LOCATIONWHERE', 'locationwhere'), 'where')]/following-sibling::dd[1]//text()"
-                ).getall()
-            ))
+            location_text = self._clean(" ".join(_XP_DT_LOCATION(root)))
 
         # Price (best-effort)
-        price_text = self._clean(" ".join(
-            response.xpath(
-                "//dt[contains(translate(., 'PRICECOST', 'pricecost'), 'price') or "
-                "contains(translate(., 'PRICECOST', 'pricecost'), 'cost')]/following-sibling::dd[1]//text()"
-            ).getall()
-        ))
+        price_text = self._clean(" ".join(_XP_DT_PRICE(root)))
 
         # Categories
-        cats = response.css("[class*='category'] a::text, .tags a::text").getall()
+        cats = _XP_CATEGORIES(root)
         cats = [self._clean(c) for c in cats if self._clean(c)] or None
 
         # Image
-        image = response.css("meta[property='og:image']::attr(content)").get() \
-            or response.css("meta[name='twitter:image']::attr(content)").get()
+        image = _first_str(_XP_IMAGE_META(root))
         if not image:
-            img = response.css("article img::attr(src), main img::attr(src)").get()
+            img = _first_str(_XP_IMAGE(root))
             if img:
                 image = urljoin(response.url, img)
 
@@ -494,5 +534,5 @@ class QueenstownEventsSpider(scrapy.Spider):
             "location": location_text,
             "categories": cats or None,
             "image": image,
-            "updated_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+            "updated_at": utc_stamp(),
         }
@@ -191,20 +191,105 @@ def parse_prices(text: str):
     maxv = max(nums) if nums else None
     return {"currency": "NZD", "min": minv, "max": maxv, "text": clean(text), "free": free}
 
+_MONTH_NAMES = ["January","February","March","April","May","June","July","August","September","October","November","December"]
+_MONTH_KEYS = [m[:3] for m in _MONTH_NAMES]
+_FULL_MONTHS = {m.lower() for m in _MONTH_NAMES}
+# Full names and 3-letter abbreviations in one alternation, scanned once with finditer
+_MONTH_TOKEN_RE = re.compile(r"\b(?:" + "|".join(_MONTH_NAMES + _MONTH_KEYS) + r")\b", re.I)
+
 def nz_months(text: str):
     if not text:
         return None
-    months = ["January","February","March","April","May","June","July","August","September","October","November","December",
-              "Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
-    found = []
-    for m in months:
-        if re.search(rf"\b{re.escape(m)}\b", text, re.I):
-            key = m[:3].title()
-            if key not in found:
-                found.append(key)
+    full, abbr = set(), set()
+    for m in _MONTH_TOKEN_RE.finditer(text):
+        tok = m.group().lower()
+        (full if tok in _FULL_MONTHS else abbr).add(tok[:3].title())
+    # Same order as before: months spelled out first, then abbreviation-only ones, each in calendar order
+    found = [k for k in _MONTH_KEYS if k in full] + [k for k in _MONTH_KEYS if k in abbr and k not in full]
     return found or None
 
 def build_embedding_text(name, description, location, dates_text, price_text, categories):
     bits = [name, description, location.get("address"), location.get("city"), location.get("region"),
             dates_text, price_text, ", ".join(categories or [])]
     return clean(" | ".join([b for b in bits if b]))
+
+# ---------------------------
+# Playwright helpers
+# ---------------------------
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_HOSTS = ("google-analytics", "googletagmanager", "doubleclick", "facebook.net", "hotjar")
+
+def should_abort_request(request) -> bool:
+    """PLAYWRIGHT_ABORT_REQUEST hook: drop what the link harvesters never look at."""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    url = request.url
+    return any(h in url for h in BLOCKED_HOSTS)
+
+_PSEUDO_ELEMENT_RE = re.compile(r"::(?:attr\([^)]*\)|text)")
+
+def element_selector(css: str) -> str:
+    """Element-only form of a parsel CSS selector (no ::attr()/::text) for in-browser queries."""
+    return _PSEUDO_ELEMENT_RE.sub("", css)
+
+# ---------------------------
+# Timestamps
+# ---------------------------
+import time as _time
+
+_STAMP = [0, ""]
+
+def utc_stamp() -> str:
+    """UTC 'YYYY-MM-DDTHH:MM:SSZ'; formatted in C, at most once per second."""
+    now = int(_time.time())
+    if now != _STAMP[0]:
+        _STAMP[0] = now
+        _STAMP[1] = _time.strftime("%Y-%m-%dT%H:%M:%SZ", _time.gmtime(now))
+    return _STAMP[1]
+
+# ---------------------------
+# Feed export
+# ---------------------------
+import orjson as _orjson
+from scrapy.exporters import BaseItemExporter as _BaseItemExporter
+
+class OrjsonLinesItemExporter(_BaseItemExporter):
+    """'jsonlines' exporter that encodes each item in C via orjson (always UTF-8)."""
+
+    def __init__(self, file, **kwargs):
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+
+    def export_item(self, item):
+        fields = dict(self._get_serialized_fields(item))
+        self.file.write(_orjson.dumps(fields, option=_orjson.OPT_APPEND_NEWLINE))
+
+# ---------------------------
+# Sitemaps
+# ---------------------------
+from io import BytesIO as _BytesIO
+from lxml import etree as _etree
+
+def iter_sitemap_locs(body: bytes, parents: tuple[str, ...] = ("url", "sitemap")):
+    """
+    Stream <loc> values out of a sitemap without building the whole tree.
+    Only locs directly under one of ``parents`` count (skips e.g. <image:loc>).
+    Stops quietly on a body lxml cannot parse.
+    """
+    context = _etree.iterparse(
+        _BytesIO(body), events=("end",), tag="{*}loc",
+        recover=True, resolve_entities=False, no_network=True,
+    )
+    try:
+        for _, elem in context:
+            entry = elem.getparent()
+            loc = (elem.text or "").strip()
+            if entry is not None and _etree.QName(entry).localname in parents and loc:
+                yield loc
+            # Drop finished <url>/<sitemap> entries so memory stays flat
+            elem.clear()
+            if entry is not None and entry.getparent() is not None:
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+    except _etree.XMLSyntaxError:
+        return